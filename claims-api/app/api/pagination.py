@@ -0,0 +1,15 @@
+from typing import Any, Dict, List
+
+
+def keyset_page(rows: List[Any], limit: int) -> Dict[str, Any]:
+    """
+    Wrap one newest-first page of rows with the cursor of the next page.
+
+    The cursor is the (created_at, id) of the last row. It is only set on a
+    full page, so a short page tells the client it has reached the end.
+    """
+    page = {"items": rows, "next_before": None, "next_before_id": None}
+    if rows and len(rows) == limit:
+        page["next_before"] = rows[-1].created_at
+        page["next_before_id"] = rows[-1].id
+    return page
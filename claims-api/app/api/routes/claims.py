@@ -6,21 +6,22 @@ You should implement your own routes and logic based on your chosen framework.
 
 # Example FastAPI route stubs (modify based on your framework choice)
 
-from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, status
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, UploadFile, File, status
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 from datetime import datetime
 
-from app.models.schemas import Claim, ClaimCreate, ClaimStatus, AISuggestion, ClaimUpdate
-from app.models.enums import ClaimStatus
-from app.database import get_db
-from sqlalchemy.orm import Session
-from app.services.video_service import VideoService
-from app.services.ai_service import AIService
+from app.models.schemas import Claim, ClaimCreate, ClaimPage, ClaimStatus, AISuggestion, ClaimUpdate
+from app.models.enums import ClaimStatus, ClaimStatusLit
 from app.services.claims_service import ClaimsService
 from app.dependencies import get_claims_service
+from app.api.pagination import keyset_page
+from app.api.serialization import MsgspecRoute
+from app.cache import CLAIMS_CACHE_PREFIX, cached
+from app.tasks import generate_claim_suggestions
 
 router = APIRouter(
+    route_class=MsgspecRoute,
     prefix="/claims",
     tags=["claims"],
     responses={
@@ -29,12 +30,13 @@ router = APIRouter(
     }
 )
 
-video_service = VideoService()
-ai_service = AIService()
+VIDEO_CHUNK_SIZE = 1024 * 1024  # 1MB
+METRICS_CACHE_TTL = 30  # seconds
 
 @router.post(
     "",
     response_model=Claim,
+    response_model_exclude_none=True,
     status_code=status.HTTP_201_CREATED,
     summary="Create a new claim",
     description="""
@@ -45,14 +47,19 @@ ai_service = AIService()
     - Claim items with their details
     
     The claim will be created with an initial status of 'SUBMITTED'.
+    AI suggestions are generated in the background; poll
+    `/claims/{claim_id}/suggestions` for them.
     """
 )
 async def create_claim(
     claim: ClaimCreate,
+    background_tasks: BackgroundTasks,
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> Claim:
     """Create a new claim."""
-    return claims_service.create_claim(claim)
+    created_claim = await claims_service.create_claim(claim)
+    background_tasks.add_task(generate_claim_suggestions, created_claim.id)
+    return created_claim
 
 @router.get(
     "/{claim_id}",
@@ -65,7 +72,7 @@ async def get_claim(
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> Claim:
     """Get a claim by ID."""
-    claim = claims_service.get_claim(claim_id)
+    claim = await claims_service.get_claim(claim_id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     return claim
@@ -76,35 +83,35 @@ async def get_claim(
     summary="List claims",
     description="""
     Retrieve a list of claims with optional filtering.
-    Supports filtering by status and policyholder name.
+    Supports filtering by status, policy number and policyholder name.
     Results are paginated with a default limit of 100 claims.
     """
 )
 async def get_claims(
-    skip: int = 0,
-    limit: int = 100,
-    status: Optional[ClaimStatus] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    status: Optional[ClaimStatusLit] = None,
     policy_number: Optional[str] = None,
     policyholder_name: Optional[str] = None,
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> List[Claim]:
     """Get claims with optional filters."""
-    return claims_service.get_claims(
+    return await claims_service.get_claims(
         skip=skip,
         limit=limit,
-        status=status,
+        status=ClaimStatus(status) if status else None,
         policy_number=policy_number,
         policyholder_name=policyholder_name
     )
 
-@router.put("/{claim_id}", response_model=Claim)
+@router.put("/{claim_id}", response_model=Claim, response_model_exclude_none=True)
 async def update_claim(
     claim_id: UUID,
     claim: ClaimUpdate,
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> Claim:
     """Update a claim."""
-    updated_claim = claims_service.update_claim(claim_id, claim)
+    updated_claim = await claims_service.update_claim(claim_id, claim)
     if not updated_claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     return updated_claim
@@ -115,47 +122,69 @@ async def delete_claim(
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> dict:
     """Delete a claim."""
-    if not claims_service.delete_claim(claim_id):
+    if not await claims_service.delete_claim(claim_id):
         raise HTTPException(status_code=404, detail="Claim not found")
     return {"message": "Claim deleted successfully"}
 
-@router.patch("/{claim_id}/status", response_model=Claim)
+@router.patch("/{claim_id}/status", response_model=Claim, response_model_exclude_none=True)
 async def update_claim_status(
     claim_id: UUID,
-    status: ClaimStatus,
+    status: ClaimStatusLit,
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> Claim:
     """Update claim status."""
-    updated_claim = claims_service.update_claim_status(claim_id, status)
+    updated_claim = await claims_service.update_claim_status(claim_id, ClaimStatus(status))
     if not updated_claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     return updated_claim
 
 @router.get("/with-video-analysis/", response_model=List[Claim])
+@cached(
+    "claims:with-video-analysis",
+    ttl=METRICS_CACHE_TTL,
+    model=List[Claim],
+    prefix=CLAIMS_CACHE_PREFIX
+)
 async def get_claims_with_video_analysis(
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> List[Claim]:
     """Get claims that have video analysis results."""
-    return claims_service.get_claims_with_video_analysis()
-
-@router.get("/recent/", response_model=List[Claim])
+    return await claims_service.get_claims_with_video_analysis()
+
+@router.get("/recent/", response_model=ClaimPage)
+@cached(
+    "claims:recent:{days}:{limit}:{before}:{before_id}",
+    ttl=METRICS_CACHE_TTL,
+    model=ClaimPage,
+    prefix=CLAIMS_CACHE_PREFIX
+)
 async def get_recent_claims(
     days: int = 7,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[datetime] = Query(None, description="next_before of the previous page"),
+    before_id: Optional[UUID] = Query(None, description="next_before_id of the previous page"),
     claims_service: ClaimsService = Depends(get_claims_service)
-) -> List[Claim]:
-    """Get claims created within the last N days."""
-    return claims_service.get_recent_claims(days)
+) -> ClaimPage:
+    """Get claims created within the last N days, newest first, one page at a time."""
+    claims = await claims_service.get_recent_claims(days, limit, before, before_id)
+    return keyset_page(claims, limit)
 
 @router.get("/metrics/")
+@cached("claims:metrics", ttl=METRICS_CACHE_TTL, prefix=CLAIMS_CACHE_PREFIX)
 async def get_claim_metrics(
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> dict:
     """Get claim metrics."""
-    return claims_service.get_claim_metrics()
+    return await claims_service.get_claim_metrics()
+
+async def _iter_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an uploaded file in fixed-size chunks instead of reading it whole."""
+    while chunk := await upload.read(VIDEO_CHUNK_SIZE):
+        yield chunk
 
 @router.post(
     "/{claim_id}/video",
-    response_model=List[AISuggestion],
+    response_model=dict,
     status_code=status.HTTP_201_CREATED,
     summary="Upload claim video",
     description="""
@@ -164,7 +193,7 @@ async def get_claim_metrics(
     The video will be:
     1. Validated for format, size, and duration
     2. Analyzed using OpenAI Vision API
-    3. Used to generate AI suggestions for the claim
+    3. Used to generate AI suggestions for the claim, in the background
     
     Supported video formats: MP4, QuickTime, AVI, MKV
     Maximum file size: 100MB
@@ -173,14 +202,18 @@ async def get_claim_metrics(
 )
 async def upload_video(
     claim_id: UUID,
+    background_tasks: BackgroundTasks,
     video: UploadFile = File(...),
     claims_service: ClaimsService = Depends(get_claims_service)
 ) -> dict:
     """Upload and process a video for a claim."""
-    if not claims_service.get_claim(claim_id):
+    if not await claims_service.claim_exists(claim_id):
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    video_content = await video.read()
-    analysis = claims_service.process_video_upload(claim_id, video_content)
+    try:
+        analysis = await claims_service.process_video_upload(claim_id, _iter_upload(video))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    background_tasks.add_task(generate_claim_suggestions, claim_id)
     return {"message": "Video processed successfully", "analysis": analysis}
 
@@ -10,15 +10,24 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
-from app.models.schemas import AISuggestion, SuggestionReview, Claim, SuggestionCreate, SuggestionUpdate
-from app.models.enums import SuggestionStatus, SuggestionType
-from app.database import get_db
-from app.services.ai_service import AIService
-from sqlalchemy.orm import Session
+from app.models.schemas import (
+    AISuggestion,
+    SuggestionCreate,
+    SuggestionPage,
+    SuggestionReview,
+    SuggestionSummary,
+    SuggestionUpdate
+)
+from app.models.enums import SuggestionStatus, SuggestionStatusLit, SuggestionType, SuggestionTypeLit
+from app.services.claims_service import ClaimsService
 from app.services.suggestions_service import SuggestionsService
-from app.dependencies import get_suggestions_service
+from app.dependencies import get_claims_service, get_suggestions_service
+from app.api.pagination import keyset_page
+from app.api.serialization import MsgspecRoute
+from app.cache import SUGGESTIONS_CACHE_PREFIX, cached
 
 router = APIRouter(
+    route_class=MsgspecRoute,
     prefix="/suggestions",
     tags=["suggestions"],
     responses={
@@ -28,7 +37,7 @@ router = APIRouter(
     }
 )
 
-ai_service = AIService()
+METRICS_CACHE_TTL = 30  # seconds
 
 @router.post(
     "/claims/{claim_id}/suggestions",
@@ -51,13 +60,18 @@ ai_service = AIService()
     - Specific action to take
     """
 )
-async def generate_suggestions(claim_id: UUID, db: Session = Depends(get_db)):
+async def generate_suggestions(
+    claim_id: UUID,
+    claims_service: ClaimsService = Depends(get_claims_service),
+    suggestions_service: SuggestionsService = Depends(get_suggestions_service)
+):
     """
     Generate AI suggestions for a claim.
     
     Args:
         claim_id (UUID): The unique identifier of the claim
-        db (Session): Database session dependency
+        claims_service (ClaimsService): Claims service dependency
+        suggestions_service (SuggestionsService): Suggestions service dependency
         
     Returns:
         List[AISuggestion]: List of AI-generated suggestions
@@ -66,60 +80,95 @@ async def generate_suggestions(claim_id: UUID, db: Session = Depends(get_db)):
         HTTPException: If the claim is not found or suggestion generation fails
     """
     # Verify claim exists
-    claim = db.query(Claim).filter(Claim.id == claim_id).first()
+    claim = await claims_service.get_claim(claim_id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
     try:
-        # Generate suggestions using AI service
-        suggestions = ai_service.analyze_claim(claim)
-        
-        # Save suggestions to database
-        for suggestion in suggestions:
-            db.add(suggestion)
-        db.commit()
-        
-        # Refresh all suggestions to get their database state
-        for suggestion in suggestions:
-            db.refresh(suggestion)
-            
-        return suggestions
+        suggestions = await suggestions_service.generate_suggestions(claim)
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return suggestions
 
 @router.get(
     "/claims/{claim_id}/suggestions",
-    response_model=List[AISuggestion],
+    response_model=SuggestionPage,
     summary="List claim suggestions",
-    description="Retrieve all AI-generated suggestions for a specific claim."
+    description="""
+    Retrieve AI-generated suggestions for a specific claim, newest first.
+    Results are paginated with a default limit of 100 suggestions; pass a
+    page's `next_before` and `next_before_id` back as `before` and
+    `before_id` to get the next one.
+    """
 )
 async def list_claim_suggestions(
     claim_id: UUID,
-    status: Optional[SuggestionStatus] = Query(None, description="Filter by suggestion status"),
-    db: Session = Depends(get_db)
+    status: Optional[SuggestionStatusLit] = Query(None, description="Filter by suggestion status"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of suggestions to return"),
+    before: Optional[datetime] = Query(None, description="next_before of the previous page"),
+    before_id: Optional[UUID] = Query(None, description="next_before_id of the previous page"),
+    suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ):
     """
-    Get all suggestions for a specific claim.
+    Get suggestions for a specific claim.
     
     Args:
         claim_id (UUID): The unique identifier of the claim
-        status (Optional[SuggestionStatus]): Filter suggestions by status
-        db (Session): Database session dependency
+        status (Optional[SuggestionStatusLit]): Filter suggestions by status
+        limit (int): Maximum number of suggestions to return
+        before (Optional[datetime]): created_at of the last suggestion already seen
+        before_id (Optional[UUID]): ID of the last suggestion already seen
+        suggestions_service (SuggestionsService): Suggestions service dependency
         
     Returns:
-        List[AISuggestion]: List of suggestions for the claim
-        
-    Raises:
-        HTTPException: If the claim is not found
+        SuggestionPage: A page of suggestions for the claim and the next page's cursor
     """
-    query = db.query(AISuggestion).filter(AISuggestion.claim_id == claim_id)
+    suggestions = await suggestions_service.get_claim_suggestions(
+        claim_id,
+        status=SuggestionStatus(status) if status else None,
+        limit=limit,
+        before=before,
+        before_id=before_id
+    )
+    return keyset_page(suggestions, limit)
+
+# Declared before "/{suggestion_id}" so the path isn't captured as an ID
+@router.get(
+    "/metrics",
+    response_model=dict,
+    summary="Get suggestion metrics",
+    description="""
+    Retrieve metrics about AI suggestions.
     
-    if status:
-        query = query.filter(AISuggestion.status == status)
+    Includes:
+    - Total number of suggestions
+    - Acceptance rate
+    - Rejection rate
+    - Modification rate
+    - Suggestions by type
+    """
+)
+@cached("suggestions:metrics", ttl=METRICS_CACHE_TTL, prefix=SUGGESTIONS_CACHE_PREFIX)
+async def get_suggestion_metrics(
+    suggestions_service: SuggestionsService = Depends(get_suggestions_service)
+):
+    """
+    Get metrics on suggestion accuracy and acceptance rates.
     
-    suggestions = query.order_by(AISuggestion.created_at.desc()).all()
-    return suggestions
+    Args:
+        suggestions_service (SuggestionsService): Suggestions service dependency
+        
+    Returns:
+        dict: Dictionary containing various suggestion metrics
+        
+    Raises:
+        HTTPException: If metrics calculation fails
+    """
+    try:
+        return await suggestions_service.get_suggestion_metrics()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get(
     "/{suggestion_id}",
@@ -127,13 +176,16 @@ async def list_claim_suggestions(
     summary="Get suggestion details",
     description="Retrieve detailed information about a specific suggestion."
 )
-async def get_suggestion(suggestion_id: UUID, db: Session = Depends(get_db)):
+async def get_suggestion(
+    suggestion_id: UUID,
+    suggestions_service: SuggestionsService = Depends(get_suggestions_service)
+) -> AISuggestion:
     """
     Get details for a specific suggestion.
     
     Args:
         suggestion_id (UUID): The unique identifier of the suggestion
-        db (Session): Database session dependency
+        suggestions_service (SuggestionsService): Suggestions service dependency
         
     Returns:
         AISuggestion: The suggestion details
@@ -141,7 +193,7 @@ async def get_suggestion(suggestion_id: UUID, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If the suggestion is not found
     """
-    suggestion = db.query(AISuggestion).filter(AISuggestion.id == suggestion_id).first()
+    suggestion = await suggestions_service.get_suggestion(suggestion_id)
     if not suggestion:
         raise HTTPException(status_code=404, detail="Suggestion not found")
     return suggestion
@@ -164,7 +216,7 @@ async def get_suggestion(suggestion_id: UUID, db: Session = Depends(get_db)):
 async def review_suggestion(
     suggestion_id: UUID,
     review: SuggestionReview,
-    db: Session = Depends(get_db)
+    suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ):
     """
     Review an AI-generated suggestion.
@@ -172,7 +224,7 @@ async def review_suggestion(
     Args:
         suggestion_id (UUID): The unique identifier of the suggestion
         review (SuggestionReview): The review decision and notes
-        db (Session): Database session dependency
+        suggestions_service (SuggestionsService): Suggestions service dependency
         
     Returns:
         AISuggestion: The updated suggestion with review information
@@ -180,7 +232,7 @@ async def review_suggestion(
     Raises:
         HTTPException: If the suggestion is not found or has already been reviewed
     """
-    suggestion = db.query(AISuggestion).filter(AISuggestion.id == suggestion_id).first()
+    suggestion = await suggestions_service.get_suggestion(suggestion_id)
     if not suggestion:
         raise HTTPException(status_code=404, detail="Suggestion not found")
     
@@ -188,115 +240,49 @@ async def review_suggestion(
         raise HTTPException(status_code=400, detail="Suggestion has already been reviewed")
     
     try:
-        suggestion.status = review.status
-        suggestion.reviewer_id = review.reviewer_id
-        suggestion.reviewer_notes = review.reviewer_notes
-        suggestion.reviewed_at = datetime.utcnow()
-        
-        if review.modified_action:
-            suggestion.suggested_action = review.modified_action
-        
-        db.commit()
-        db.refresh(suggestion)
-        return suggestion
+        reviewed_suggestion = await suggestions_service.update_suggestion_status(
+            suggestion_id,
+            review.status,
+            review.reviewer_id,
+            review.reviewer_notes,
+            review.modified_action
+        )
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-
-@router.get(
-    "/metrics",
-    response_model=dict,
-    summary="Get suggestion metrics",
-    description="""
-    Retrieve metrics about AI suggestions.
     
-    Includes:
-    - Total number of suggestions
-    - Acceptance rate
-    - Rejection rate
-    - Modification rate
-    - Suggestions by type
-    """
-)
-async def get_suggestion_metrics(db: Session = Depends(get_db)):
-    """
-    Get metrics on suggestion accuracy and acceptance rates.
-    
-    Args:
-        db (Session): Database session dependency
-        
-    Returns:
-        dict: Dictionary containing various suggestion metrics
-        
-    Raises:
-        HTTPException: If metrics calculation fails
-    """
-    try:
-        total_suggestions = db.query(AISuggestion).count()
-        accepted_suggestions = db.query(AISuggestion).filter(
-            AISuggestion.status == SuggestionStatus.ACCEPTED
-        ).count()
-        rejected_suggestions = db.query(AISuggestion).filter(
-            AISuggestion.status == SuggestionStatus.REJECTED
-        ).count()
-        modified_suggestions = db.query(AISuggestion).filter(
-            AISuggestion.status == SuggestionStatus.MODIFIED
-        ).count()
-        
-        return {
-            "total_suggestions": total_suggestions,
-            "acceptance_rate": accepted_suggestions / total_suggestions if total_suggestions > 0 else 0,
-            "rejection_rate": rejected_suggestions / total_suggestions if total_suggestions > 0 else 0,
-            "modification_rate": modified_suggestions / total_suggestions if total_suggestions > 0 else 0,
-            "suggestions_by_type": db.query(
-                AISuggestion.type,
-                db.func.count(AISuggestion.id)
-            ).group_by(AISuggestion.type).all()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return reviewed_suggestion
 
-@router.post("/", response_model=AISuggestion)
+@router.post("/", response_model=AISuggestion, response_model_exclude_none=True)
 async def create_suggestion(
     suggestion: SuggestionCreate,
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ) -> AISuggestion:
     """Create a new suggestion."""
-    return suggestions_service.create_suggestion(suggestion)
-
-@router.get("/{suggestion_id}", response_model=AISuggestion)
-async def get_suggestion(
-    suggestion_id: UUID,
-    suggestions_service: SuggestionsService = Depends(get_suggestions_service)
-) -> AISuggestion:
-    """Get a suggestion by ID."""
-    suggestion = suggestions_service.get_suggestion(suggestion_id)
-    if not suggestion:
-        raise HTTPException(status_code=404, detail="Suggestion not found")
-    return suggestion
+    created_suggestion = await suggestions_service.create_suggestion(suggestion)
+    return created_suggestion
 
 @router.get("/", response_model=List[AISuggestion])
 async def get_suggestions(
     claim_id: Optional[UUID] = None,
-    status: Optional[SuggestionStatus] = None,
-    type: Optional[SuggestionType] = None,
+    status: Optional[SuggestionStatusLit] = None,
+    type: Optional[SuggestionTypeLit] = None,
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ) -> List[AISuggestion]:
     """Get suggestions with optional filters."""
-    return suggestions_service.get_suggestions(
+    return await suggestions_service.get_suggestions(
         claim_id=claim_id,
-        status=status,
-        type=type
+        status=SuggestionStatus(status) if status else None,
+        type=SuggestionType(type) if type else None
     )
 
-@router.put("/{suggestion_id}", response_model=AISuggestion)
+@router.put("/{suggestion_id}", response_model=AISuggestion, response_model_exclude_none=True)
 async def update_suggestion(
     suggestion_id: UUID,
     suggestion: SuggestionUpdate,
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ) -> AISuggestion:
     """Update a suggestion."""
-    updated_suggestion = suggestions_service.update_suggestion(suggestion_id, suggestion)
+    updated_suggestion = await suggestions_service.update_suggestion(suggestion_id, suggestion)
     if not updated_suggestion:
         raise HTTPException(status_code=404, detail="Suggestion not found")
     return updated_suggestion
@@ -307,23 +293,23 @@ async def delete_suggestion(
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ) -> dict:
     """Delete a suggestion."""
-    if not suggestions_service.delete_suggestion(suggestion_id):
+    if not await suggestions_service.delete_suggestion(suggestion_id):
         raise HTTPException(status_code=404, detail="Suggestion not found")
     return {"message": "Suggestion deleted successfully"}
 
-@router.patch("/{suggestion_id}/status", response_model=AISuggestion)
+@router.patch("/{suggestion_id}/status", response_model=AISuggestion, response_model_exclude_none=True)
 async def update_suggestion_status(
     suggestion_id: UUID,
-    status: SuggestionStatus,
+    status: SuggestionStatusLit,
     reviewer_id: UUID,
     reviewer_notes: Optional[str] = None,
     modified_action: Optional[str] = None,
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ) -> AISuggestion:
     """Update suggestion status and review information."""
-    updated_suggestion = suggestions_service.update_suggestion_status(
+    updated_suggestion = await suggestions_service.update_suggestion_status(
         suggestion_id,
-        status,
+        SuggestionStatus(status),
         reviewer_id,
         reviewer_notes,
         modified_action
@@ -332,32 +318,30 @@ async def update_suggestion_status(
         raise HTTPException(status_code=404, detail="Suggestion not found")
     return updated_suggestion
 
-@router.get("/metrics/")
-async def get_suggestion_metrics(
-    suggestions_service: SuggestionsService = Depends(get_suggestions_service)
-) -> dict:
-    """Get suggestion metrics."""
-    return suggestions_service.get_suggestion_metrics()
-
-@router.get("/high-confidence/", response_model=List[AISuggestion])
+@router.get("/high-confidence/", response_model=List[SuggestionSummary])
 async def get_high_confidence_suggestions(
     threshold: float = 0.8,
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
-) -> List[AISuggestion]:
+) -> List[SuggestionSummary]:
     """Get suggestions with confidence score above threshold."""
-    return suggestions_service.get_high_confidence_suggestions(threshold)
+    return await suggestions_service.get_high_confidence_suggestions(threshold)
 
-@router.get("/pending/", response_model=List[AISuggestion])
+@router.get("/pending/", response_model=List[SuggestionSummary])
 async def get_pending_suggestions(
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
-) -> List[AISuggestion]:
+) -> List[SuggestionSummary]:
     """Get all pending suggestions."""
-    return suggestions_service.get_pending_suggestions()
+    return await suggestions_service.get_pending_suggestions()
 
 @router.post("/{claim_id}/regenerate", response_model=List[AISuggestion])
 async def regenerate_suggestions(
     claim_id: UUID,
+    claims_service: ClaimsService = Depends(get_claims_service),
     suggestions_service: SuggestionsService = Depends(get_suggestions_service)
 ) -> List[AISuggestion]:
     """Regenerate suggestions for a claim using AI."""
-    return suggestions_service.regenerate_suggestions(claim_id)
+    claim = await claims_service.get_claim(claim_id)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    suggestions = await suggestions_service.regenerate_suggestions(claim)
+    return suggestions
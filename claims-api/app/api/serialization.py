@@ -0,0 +1,246 @@
+from functools import lru_cache, wraps
+import inspect
+from typing import Annotated, Any, List, Literal, Optional, Type, Union, get_args, get_origin
+
+import msgspec
+from msgspec import UnsetType
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field, create_model
+
+REF_TEMPLATE = "#/components/schemas/{name}"
+
+# Struct types decoded straight from request bodies; see add_body_schemas()
+_body_types = set()
+
+# Shared encoder, created once at import rather than per response
+_encoder = msgspec.json.Encoder()
+
+
+class MsgspecJSONResponse(ORJSONResponse):
+    """JSON response rendered by msgspec's encoder instead of orjson/json."""
+
+    def render(self, content: Any) -> bytes:
+        return _encoder.encode(content)
+
+
+def is_struct_type(tp: Any) -> bool:
+    """Check whether an annotation is a msgspec Struct class."""
+    return inspect.isclass(tp) and issubclass(tp, msgspec.Struct)
+
+
+def _contains_struct(tp: Any) -> bool:
+    if is_struct_type(tp):
+        return True
+    return any(_contains_struct(arg) for arg in get_args(tp))
+
+
+def _tag_field(tp: Any) -> Optional[str]:
+    return tp.__struct_config__.tag_field if is_struct_type(tp) else None
+
+
+def _to_pydantic_annotation(tp: Any) -> Any:
+    """Rewrite an annotation so every Struct in it is replaced by its Pydantic twin."""
+    if is_struct_type(tp):
+        return msgspec_to_pydantic(tp)
+    origin = get_origin(tp)
+    if origin is Union:
+        members = [arg for arg in get_args(tp) if arg is not UnsetType]
+        nullable = type(None) in members
+        members = [arg for arg in members if arg is not type(None)]
+        tag_fields = {_tag_field(arg) for arg in members}
+        if len(members) > 1 and len(tag_fields) == 1 and None not in tag_fields:
+            # Tagged union: let pydantic pick the variant by its tag
+            annotation = Annotated[
+                Union[tuple(_to_pydantic_annotation(arg) for arg in members)],
+                Field(discriminator=tag_fields.pop())
+            ]
+        else:
+            annotation = Union[tuple(_to_pydantic_annotation(arg) for arg in members)]
+        return Optional[annotation] if nullable else annotation
+    if origin is list:
+        return List[_to_pydantic_annotation(get_args(tp)[0])]
+    return tp
+
+
+@lru_cache(maxsize=None)
+def msgspec_to_pydantic(struct_type: Type[msgspec.Struct]) -> Type[BaseModel]:
+    """
+    Build a Pydantic model mirroring a msgspec Struct.
+
+    The model is only used by FastAPI for the OpenAPI schema and request
+    validation; responses are encoded straight from the Struct by msgspec.
+    """
+    fields = {}
+    config = struct_type.__struct_config__
+    if config.tag_field is not None:
+        fields[config.tag_field] = (Literal[config.tag], config.tag)
+    for field in msgspec.structs.fields(struct_type):
+        annotation = _to_pydantic_annotation(field.type)
+        if field.default is msgspec.UNSET:
+            fields[field.name] = (Optional[annotation], None)
+        elif field.default is not msgspec.NODEFAULT:
+            fields[field.name] = (annotation, field.default)
+        elif field.default_factory is not msgspec.NODEFAULT:
+            fields[field.name] = (annotation, Field(default_factory=field.default_factory))
+        else:
+            fields[field.name] = (annotation, Field(...))
+    return create_model(struct_type.__name__, **fields)
+
+
+def _request_body_schema(struct_type: Type[msgspec.Struct]) -> dict:
+    """OpenAPI requestBody for a Struct that FastAPI no longer sees as a parameter."""
+    _body_types.add(struct_type)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": REF_TEMPLATE.format(name=struct_type.__name__)}
+                }
+            },
+        }
+    }
+
+
+def add_body_schemas(openapi_schema: dict) -> dict:
+    """Register the JSON schemas of msgspec-decoded request bodies as components."""
+    if _body_types:
+        _, components = msgspec.json.schema_components(
+            sorted(_body_types, key=lambda tp: tp.__name__), ref_template=REF_TEMPLATE
+        )
+        schemas = openapi_schema.setdefault("components", {}).setdefault("schemas", {})
+        for name, schema in components.items():
+            schemas.setdefault(name, schema)
+    return openapi_schema
+
+
+async def _decode_body(request: Request, decoder: msgspec.json.Decoder) -> msgspec.Struct:
+    try:
+        return decoder.decode(await request.body())
+    except msgspec.ValidationError as exc:
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": str(exc), "input": None}]
+        )
+    except msgspec.DecodeError as exc:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body",), "msg": str(exc), "input": None}]
+        )
+
+
+def _drop_none(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _drop_none(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_drop_none(item) for item in value]
+    return value
+
+
+def _wrap_endpoint(
+    endpoint,
+    response_type: Any,
+    status_code: Optional[int],
+    exclude_none: bool = False
+):
+    """
+    Wrap an endpoint so a Struct body is decoded by msgspec straight from the
+    raw request bytes, and results are returned as a pre-encoded response,
+    bypassing FastAPI's body parsing and jsonable_encoder.
+
+    Routes take at most one Struct body parameter. With `exclude_none`, None
+    values are left out of the response like `response_model_exclude_none`.
+    """
+    signature = inspect.signature(endpoint)
+    body_param = next(
+        (
+            (name, param.annotation)
+            for name, param in signature.parameters.items()
+            if is_struct_type(param.annotation)
+        ),
+        None,
+    )
+    # One decoder per route, built once instead of resolving the type per request
+    body_decoder = msgspec.json.Decoder(body_param[1]) if body_param is not None else None
+    is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+    @wraps(endpoint)
+    async def wrapper(**kwargs):
+        if body_param is not None:
+            kwargs[body_param[0]] = await _decode_body(kwargs.pop("_raw_request"), body_decoder)
+        if is_coroutine:
+            result = await endpoint(**kwargs)
+        else:
+            result = await run_in_threadpool(endpoint, **kwargs)
+        if isinstance(result, Response):
+            return result
+        if response_type is not None:
+            result = msgspec.convert(result, response_type, from_attributes=True)
+        if exclude_none:
+            result = _drop_none(msgspec.to_builtins(result))
+        return MsgspecJSONResponse(result, status_code=status_code or 200)
+
+    parameters = [
+        param.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+        for param in signature.parameters.values()
+        if not is_struct_type(param.annotation)
+    ]
+    if body_param is not None:
+        parameters.append(
+            inspect.Parameter("_raw_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        )
+    wrapper.__signature__ = signature.replace(
+        parameters=parameters,
+        return_annotation=_to_pydantic_annotation(signature.return_annotation),
+    )
+    return wrapper, body_param
+
+
+class MsgspecRoute(APIRoute):
+    """
+    API route that accepts msgspec Struct annotations.
+
+    Request bodies are decoded by msgspec and documented through
+    `openapi_extra`; FastAPI sees Pydantic twins of response Structs (so docs
+    keep working), while the response is converted to the Struct type and
+    encoded by msgspec in a single pass.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        endpoint,
+        *,
+        response_model: Any = None,
+        status_code: Optional[int] = None,
+        **kwargs
+    ):
+        if isinstance(response_model, DefaultPlaceholder) or response_model is None:
+            response_type = inspect.signature(endpoint).return_annotation
+        else:
+            response_type = response_model
+        if not _contains_struct(response_type):
+            response_type = None
+        if not isinstance(response_model, DefaultPlaceholder):
+            response_model = _to_pydantic_annotation(response_model)
+        wrapped_endpoint, body_param = _wrap_endpoint(
+            endpoint,
+            response_type,
+            status_code,
+            exclude_none=kwargs.get("response_model_exclude_none", False)
+        )
+        if body_param is not None:
+            kwargs["openapi_extra"] = {
+                **_request_body_schema(body_param[1]),
+                **(kwargs.get("openapi_extra") or {}),
+            }
+        super().__init__(
+            path,
+            wrapped_endpoint,
+            response_model=response_model,
+            status_code=status_code,
+            **kwargs,
+        )
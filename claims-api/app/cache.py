@@ -0,0 +1,132 @@
+import inspect
+import logging
+from functools import wraps
+from typing import Any, Optional
+
+import msgspec
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Optional[aioredis.Redis] = None
+
+# Key prefixes of cached claim and suggestion reads, retired together on writes
+CLAIMS_CACHE_PREFIX = "claims:"
+SUGGESTIONS_CACHE_PREFIX = "suggestions:"
+
+
+def get_redis() -> aioredis.Redis:
+    """Get the shared Redis client, creating it on first use."""
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(get_settings().REDIS_URL)
+    return _redis
+
+
+async def cache_get(key: str, model: Any = Any) -> Any:
+    """Read and decode a cached value, returning None on a miss, Redis failure or stale format."""
+    try:
+        raw = await get_redis().get(key)
+    except RedisError:
+        logger.warning("Redis read failed for %s", key, exc_info=True)
+        return None
+    if raw is None:
+        return None
+    try:
+        return msgspec.json.decode(raw, type=model)
+    except (msgspec.DecodeError, msgspec.ValidationError):
+        # Written before a schema change; drop it so the caller refills it
+        logger.warning("Discarding undecodable cache entry %s", key, exc_info=True)
+        await cache_delete(key)
+        return None
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Encode and store a value for `ttl` seconds."""
+    try:
+        await get_redis().setex(key, ttl, msgspec.json.encode(value))
+    except RedisError:
+        logger.warning("Redis write failed for %s", key, exc_info=True)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Remove the given keys from the cache."""
+    try:
+        await get_redis().delete(*keys)
+    except RedisError:
+        logger.warning("Redis delete failed for %s", keys, exc_info=True)
+
+
+def _version_key(prefix: str) -> str:
+    return f"{prefix}version"
+
+
+async def _prefix_version(prefix: str) -> Optional[int]:
+    """Current version of a key prefix, or None when Redis can't be read."""
+    try:
+        raw = await get_redis().get(_version_key(prefix))
+    except RedisError:
+        logger.warning("Redis read failed for %s", _version_key(prefix), exc_info=True)
+        return None
+    return int(raw or 0)
+
+
+def cached(key: str, ttl: int, model: Any = Any, prefix: Optional[str] = None):
+    """
+    Cache an async function's result in Redis for `ttl` seconds.
+
+    `key` is formatted with the call's bound arguments, e.g. "claims:recent:{days}".
+    When `model` is given the result is converted to it before being stored,
+    so ORM objects come back from the cache as the equivalent schema Structs.
+    With a `prefix`, the key is stamped with the prefix's current version, so
+    `invalidate(prefix)` retires it. Redis failures fall through to the
+    wrapped function.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache_key = key.format(**bound.arguments)
+            if prefix is not None:
+                version = await _prefix_version(prefix)
+                # Without the version a stale entry can't be told from a fresh one
+                cache_key = None if version is None else f"{cache_key}@{version}"
+
+            if cache_key is not None:
+                result = await cache_get(cache_key, model)
+                if result is not None:
+                    return result
+
+            result = await func(*args, **kwargs)
+            if model is not Any:
+                result = msgspec.convert(result, model, from_attributes=True)
+            if cache_key is not None:
+                await cache_set(cache_key, result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate(*prefixes: str) -> None:
+    """
+    Retire every key cached under the given prefixes.
+
+    Each prefix's version is bumped rather than its keys being looked up and
+    deleted, so a write costs one round trip per prefix whatever the size of
+    the keyspace. Entries stamped with an old version are never read again
+    and expire with their TTL.
+    """
+    redis = get_redis()
+    try:
+        for prefix in prefixes:
+            await redis.incr(_version_key(prefix))
+    except RedisError:
+        logger.warning("Redis invalidation failed for %s", prefixes, exc_info=True)
@@ -1,8 +1,9 @@
-from typing import Generator
+from functools import lru_cache
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.cache import get_redis
+from app.database import get_db
 from app.repositories.claim_repository import ClaimRepository
 from app.repositories.suggestion_repository import SuggestionRepository
 from app.services.ai_service import AIService
@@ -10,28 +11,22 @@ from app.services.video_service import VideoService
 from app.services.claims_service import ClaimsService
 from app.services.suggestions_service import SuggestionsService
 
-def get_db() -> Generator[Session, None, None]:
-    """Get database session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_claim_repository(db: Session = Depends(get_db)) -> ClaimRepository:
+def get_claim_repository(db: AsyncSession = Depends(get_db)) -> ClaimRepository:
     """Get claim repository instance."""
     return ClaimRepository(db)
 
-def get_suggestion_repository(db: Session = Depends(get_db)) -> SuggestionRepository:
+def get_suggestion_repository(db: AsyncSession = Depends(get_db)) -> SuggestionRepository:
     """Get suggestion repository instance."""
     return SuggestionRepository(db)
 
+@lru_cache(maxsize=1)
 def get_ai_service() -> AIService:
-    """Get AI service instance."""
+    """Get the shared AI service instance."""
     return AIService()
 
+@lru_cache(maxsize=1)
 def get_video_service() -> VideoService:
-    """Get video service instance."""
+    """Get the shared video service instance."""
     return VideoService()
 
 def get_claims_service(
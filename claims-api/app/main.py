@@ -1,35 +1,78 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
 from app.api.routes import claims, suggestions
-from app.database import engine, Base
+from app.api.serialization import add_body_schemas
+from app.config import get_settings
+from app.database import engine, get_engine, Base
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+settings = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema changes are applied at deploy time; only create tables on
+    # startup in development, so worker boots don't run DDL
+    if settings.AUTO_CREATE_TABLES:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
 
 # Create FastAPI app
 app = FastAPI(
     title="Insurance Claims Processing API",
     description="API for processing insurance claims with AI-powered suggestions",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+    # Without an openapi_url the schema is never built; the docs pages depend on it
+    openapi_url=None if settings.DISABLE_OPENAPI else "/openapi.json",
+    docs_url=None if settings.DISABLE_OPENAPI else "/docs",
+    redoc_url=None if settings.DISABLE_OPENAPI else "/redoc"
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# Compress large JSON list responses
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(claims.router, prefix="/api", tags=["claims"])
 app.include_router(suggestions.router, prefix="/api", tags=["suggestions"])
 
+_build_openapi = app.openapi
+
+def openapi() -> dict:
+    # Request bodies are decoded by msgspec, so their schemas are added here
+    if app.openapi_schema is None:
+        add_body_schemas(_build_openapi())
+    return app.openapi_schema
+
+app.openapi = openapi
+
 @app.get("/")
 async def root():
     return {
         "message": "Welcome to the Insurance Claims Processing API",
         "docs_url": "/docs",
         "redoc_url": "/redoc"
-    } 
\ No newline at end of file
+    }
+
+@app.get("/health/db")
+async def database_health(db_engine: AsyncEngine = Depends(get_engine)):
+    # Round-trip a trivial query and report how the connection pool is used
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return {"status": "ok", "pool": db_engine.pool.status()}
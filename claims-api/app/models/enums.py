@@ -1,4 +1,5 @@
 from enum import StrEnum
+from typing import Literal
 
 class ClaimStatus(StrEnum):
     SUBMITTED = "submitted"  # Initial claim submission
@@ -27,3 +28,11 @@ class SuggestionStatus(StrEnum):
     ACCEPTED = "accepted"  # Adjuster accepted the suggestion
     REJECTED = "rejected"  # Adjuster rejected the suggestion
     MODIFIED = "modified"  # Adjuster modified and then accepted
+
+
+# Literal aliases of the enum values for query parameters: pydantic validates
+# a Literal against a precomputed set instead of iterating enum members.
+# Routes convert back to the enum before calling into the services.
+ClaimStatusLit = Literal[tuple(status.value for status in ClaimStatus)]
+SuggestionTypeLit = Literal[tuple(type.value for type in SuggestionType)]
+SuggestionStatusLit = Literal[tuple(status.value for status in SuggestionStatus)]
@@ -1,12 +1,18 @@
 from datetime import datetime
-from typing import List, Optional, TypedDict
+from typing import List, Optional, Union
 from uuid import UUID
 
+import msgspec
+from msgspec import UNSET, UnsetType
+
 from .enums import ClaimStatus, SuggestionStatus, SuggestionType
 from .types import ClaimId, SuggestionId, JsonDict
 
+# gc=False is only set on Structs whose fields are all scalars: the others hold
+# lists or nested Structs, which could end up in a reference cycle
+
 
-class Address(TypedDict):
+class Address(msgspec.Struct, frozen=True, gc=False):
     street: str
     city: str
     state: str
@@ -14,16 +20,100 @@ class Address(TypedDict):
     country: str
 
 
-class ClaimItem(TypedDict):
+class ClaimItem(msgspec.Struct, frozen=True, gc=False):
     name: str
     description: str
     category: str
     estimated_value: float
-    purchase_date: Optional[datetime]
-    replacement_cost: Optional[float]
+    purchase_date: Optional[datetime] = None
+    replacement_cost: Optional[float] = None
+
+
+# Video analysis results, tagged by "version" so new formats can join the union
+class DamageAssessment(msgspec.Struct, frozen=True):
+    visible_damage: List[str] = []
+    severity: Optional[str] = None  # low | medium | high
+    confidence: Optional[float] = None
+
+
+class PropertyCondition(msgspec.Struct, frozen=True, gc=False):
+    overall_state: Optional[str] = None  # good | fair | poor
+    maintenance_level: Optional[str] = None  # well_maintained | average | neglected
+
+
+class FraudIndicators(msgspec.Struct, frozen=True):
+    suspicious_elements: List[str] = []
+    risk_level: Optional[str] = None  # low | medium | high
+    confidence: Optional[float] = None
+
+
+class EvidenceQuality(msgspec.Struct, frozen=True):
+    coverage: Optional[str] = None  # comprehensive | partial | limited
+    clarity: Optional[str] = None  # clear | moderate | poor
+    recommendations: List[str] = []
+
+
+class VideoAnalysisV1(msgspec.Struct, frozen=True, tag_field="version", tag="v1"):
+    damage_assessment: Optional[DamageAssessment] = None
+    property_condition: Optional[PropertyCondition] = None
+    fraud_indicators: Optional[FraudIndicators] = None
+    evidence_quality: Optional[EvidenceQuality] = None
+
+
+MLProcessingResults = VideoAnalysisV1
+
+
+# Suggested actions, tagged by "type" with the matching SuggestionType value
+class SuggestedActionBase(msgspec.Struct, frozen=True, kw_only=True, tag_field="type"):
+    action: str
+    reason: Optional[str] = None
+
+
+class ApproveAction(SuggestedActionBase, tag=SuggestionType.APPROVE_CLAIM.value, gc=False):
+    total_amount: Optional[float] = None
+
+
+class DenyAction(SuggestedActionBase, tag=SuggestionType.DENY_CLAIM.value, gc=False):
+    pass
+
+
+class RequestInfoAction(SuggestedActionBase, tag=SuggestionType.REQUEST_INFO.value):
+    requested_information: List[str] = []
+
+
+class FlagFraudAction(SuggestedActionBase, tag=SuggestionType.FLAG_FRAUD.value):
+    indicators: List[str] = []
+    risk_level: Optional[str] = None
+
+
+class AdjustAmountAction(SuggestedActionBase, tag=SuggestionType.ADJUST_AMOUNT.value, gc=False):
+    current_amount: Optional[float] = None
+    adjusted_amount: Optional[float] = None
+    threshold: Optional[float] = None
+
+
+class ReplaceItemAction(SuggestedActionBase, tag=SuggestionType.REPLACE_ITEM.value, gc=False):
+    item_name: Optional[str] = None
+    replacement_cost: Optional[float] = None
 
 
-class ClaimBase(TypedDict):
+class RepairItemAction(SuggestedActionBase, tag=SuggestionType.REPAIR_ITEM.value, gc=False):
+    item_name: Optional[str] = None
+    repair_cost: Optional[float] = None
+
+
+SuggestedAction = Union[
+    ApproveAction,
+    DenyAction,
+    RequestInfoAction,
+    FlagFraudAction,
+    AdjustAmountAction,
+    ReplaceItemAction,
+    RepairItemAction,
+]
+
+
+class ClaimBase(msgspec.Struct, frozen=True):
     policy_number: str
     policyholder_name: str
     date_of_loss: datetime
@@ -37,37 +127,102 @@ class ClaimCreate(ClaimBase):
     pass
 
 
+# Partial update model: fields left UNSET are not written
+class ClaimUpdate(msgspec.Struct, frozen=True, kw_only=True):
+    policy_number: Union[str, UnsetType] = UNSET
+    policyholder_name: Union[str, UnsetType] = UNSET
+    date_of_loss: Union[datetime, UnsetType] = UNSET
+    description: Union[str, UnsetType] = UNSET
+    total_amount: Union[float, UnsetType] = UNSET
+    incident_location: Union[Address, UnsetType] = UNSET
+    items: Union[List[ClaimItem], UnsetType] = UNSET
+    status: Union[ClaimStatus, UnsetType] = UNSET
+    assigned_adjuster: Union[Optional[str], UnsetType] = UNSET
+
+
 class Claim(ClaimBase):
     id: ClaimId
     status: ClaimStatus
     created_at: datetime
     updated_at: datetime
-    assigned_adjuster: Optional[str]
-    supporting_documents: Optional[List[str]]
-    video_evidence: Optional[str]
-    ml_processing_results: Optional[JsonDict]
+    assigned_adjuster: Optional[str] = None
+    supporting_documents: Optional[List[str]] = None
+    video_evidence: Optional[str] = None
+    ml_processing_results: Optional[MLProcessingResults] = None
+
+
+# One page of a newest-first listing. Pass `next_before` and `next_before_id`
+# back as `before` and `before_id` for the next page; both are None on the last
+class ClaimPage(msgspec.Struct, frozen=True):
+    items: List[Claim]
+    next_before: Optional[datetime] = None
+    next_before_id: Optional[ClaimId] = None
 
 
-class AISuggestion(TypedDict):
+class SuggestionCreate(msgspec.Struct, frozen=True):
+    claim_id: ClaimId
+    type: SuggestionType
+    description: str
+    confidence_score: float  # 0.0 to 1.0
+    ai_explanation: str
+    suggested_action: SuggestedAction
+    model_version: str
+    status: SuggestionStatus = SuggestionStatus.PENDING
+
+
+# Partial update model: fields left UNSET are not written
+class SuggestionUpdate(msgspec.Struct, frozen=True, kw_only=True):
+    description: Union[str, UnsetType] = UNSET
+    confidence_score: Union[float, UnsetType] = UNSET
+    ai_explanation: Union[str, UnsetType] = UNSET
+    suggested_action: Union[SuggestedAction, UnsetType] = UNSET
+    status: Union[SuggestionStatus, UnsetType] = UNSET
+    reviewer_id: Union[Optional[str], UnsetType] = UNSET
+    reviewer_notes: Union[Optional[str], UnsetType] = UNSET
+
+
+class AISuggestion(msgspec.Struct, frozen=True):
     id: SuggestionId
     claim_id: ClaimId
     type: SuggestionType
     description: str
     confidence_score: float  # 0.0 to 1.0
     ai_explanation: str
-    suggested_action: JsonDict
+    suggested_action: SuggestedAction
     status: SuggestionStatus
     created_at: datetime
-    reviewed_at: Optional[datetime]
-    reviewer_id: Optional[str]
-    reviewer_notes: Optional[str]
     model_version: str
+    reviewed_at: Optional[datetime] = None
+    reviewer_id: Optional[str] = None
+    reviewer_notes: Optional[str] = None
+
+
+# One page of a claim's suggestions, newest first; see ClaimPage
+class SuggestionPage(msgspec.Struct, frozen=True):
+    items: List[AISuggestion]
+    next_before: Optional[datetime] = None
+    next_before_id: Optional[SuggestionId] = None
+
+
+# Column subset for review-queue lists, which don't need the action/explanation payloads
+class SuggestionSummary(msgspec.Struct, frozen=True, gc=False):
+    id: SuggestionId
+    claim_id: ClaimId
+    type: SuggestionType
+    confidence_score: float
+    status: SuggestionStatus
+    created_at: datetime
 
 
 # Review feedback model
-class SuggestionReview(TypedDict):
+class SuggestionReview(msgspec.Struct, frozen=True):
     suggestion_id: SuggestionId
     status: SuggestionStatus
     reviewer_id: str
-    reviewer_notes: Optional[str]
-    modified_action: Optional[JsonDict]
+    reviewer_notes: Optional[str] = None
+    modified_action: Optional[SuggestedAction] = None
+
+
+def to_record(struct: msgspec.Struct) -> JsonDict:
+    """Convert a schema struct into a plain dict for the repositories, skipping UNSET fields."""
+    return msgspec.to_builtins(struct, builtin_types=(datetime, UUID))
@@ -1,52 +1,149 @@
-from typing import Generic, TypeVar, Type, Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Tuple, TypeVar, Type, Optional, List
+import msgspec
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Executable, Select, and_, or_, select, insert, update, delete, literal
 from uuid import UUID
 
+from app.cache import cache_delete, cache_get, cache_set, invalidate
 from app.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Statements built once per (model, name) and reused across requests
+_statements: Dict[Tuple[Any, str], Executable] = {}
+
 class BaseRepository(Generic[ModelType]):
-    def __init__(self, model: Type[ModelType], db: Session):
+    # Subclasses set a key prefix to serve `get` from Redis (read-through)
+    cache_prefix: Optional[str] = None
+    cache_ttl: int = 300  # seconds
+    # Prefix of cached reads spanning many rows (listings, metrics), retired
+    # on every write so no caller has to remember to
+    list_cache_prefix: Optional[str] = None
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
         self.model = model
         self.db = db
-    
-    def get(self, id: UUID) -> Optional[ModelType]:
-        """Get a single record by ID."""
-        return self.db.query(self.model).filter(self.model.id == id).first()
-    
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+
+    def _statement(self, name: str, build: Callable[[], Executable]) -> Executable:
+        """
+        Get a reusable statement, building it on first use.
+
+        Values must be left as `bindparam`s and passed at execution time.
+        """
+        key = (self.model, name)
+        statement = _statements.get(key)
+        if statement is None:
+            statement = _statements[key] = build()
+        return statement
+
+    def _keyset_page(
+        self,
+        query: Select,
+        limit: int,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+    ) -> Select:
+        """
+        Order a query newest first and keep the `limit` rows after a cursor.
+
+        The cursor is the (created_at, id) of the last row already seen; the
+        id breaks ties between rows created in the same instant, such as a
+        batch of generated suggestions.
+        """
+        if before is not None:
+            if before_id is None:
+                query = query.where(self.model.created_at < before)
+            else:
+                query = query.where(or_(
+                    self.model.created_at < before,
+                    and_(self.model.created_at == before, self.model.id < before_id)
+                ))
+        return query.order_by(self.model.created_at.desc(), self.model.id.desc()).limit(limit)
+
+    def _cache_key(self, id: UUID) -> str:
+        return f"{self.cache_prefix}:{id}"
+
+    async def get(self, id: UUID) -> Optional[ModelType]:
+        """
+        Get a single record by ID, consulting the cache first.
+
+        With a cache the record is returned as a detached, frozen Struct
+        whether or not it was cached, so callers see the same type either
+        way; writes load their own row through the session.
+        """
+        if self.cache_prefix is None:
+            return await self.db.get(self.model, id)
+
+        key = self._cache_key(id)
+        cached = await cache_get(key, self.model)
+        if cached is not None:
+            return cached
+
+        db_obj = await self.db.get(self.model, id)
+        if db_obj is None:
+            return None
+        record = msgspec.convert(db_obj, self.model, from_attributes=True)
+        await cache_set(key, record, self.cache_ttl)
+        return record
+
+    async def _invalidate(self, *ids: UUID) -> None:
+        if ids and self.cache_prefix is not None:
+            await cache_delete(*(self._cache_key(id) for id in ids))
+        if self.list_cache_prefix is not None:
+            await invalidate(self.list_cache_prefix)
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination."""
-        return self.db.query(self.model).offset(skip).limit(limit).all()
-    
-    def create(self, obj_in: dict) -> ModelType:
+        result = await self.db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def create(self, obj_in: dict) -> ModelType:
         """Create a new record."""
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        await self._invalidate()
         return db_obj
-    
-    def update(self, id: UUID, obj_in: dict) -> Optional[ModelType]:
+
+    async def bulk_create(self, objs_in: List[dict]) -> List[ModelType]:
+        """Insert several records with one batched INSERT and a single commit."""
+        if not objs_in:
+            return []
+        result = await self.db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            objs_in
+        )
+        db_objs = list(result.all())
+        await self.db.commit()
+        await self._invalidate()
+        return db_objs
+
+    async def update(self, id: UUID, obj_in: dict) -> Optional[ModelType]:
         """Update a record."""
-        db_obj = self.get(id)
+        db_obj = await self.db.get(self.model, id)
         if db_obj:
             for key, value in obj_in.items():
                 setattr(db_obj, key, value)
-            self.db.commit()
-            self.db.refresh(db_obj)
+            await self.db.commit()
+            await self.db.refresh(db_obj)
+            await self._invalidate(id)
         return db_obj
-    
-    def delete(self, id: UUID) -> bool:
+
+    async def delete(self, id: UUID) -> bool:
         """Delete a record."""
-        db_obj = self.get(id)
+        db_obj = await self.db.get(self.model, id)
         if db_obj:
-            self.db.delete(db_obj)
-            self.db.commit()
+            await self.db.delete(db_obj)
+            await self.db.commit()
+            await self._invalidate(id)
             return True
         return False
-    
-    def exists(self, id: UUID) -> bool:
+
+    async def exists(self, id: UUID) -> bool:
         """Check if a record exists."""
-        return self.db.query(self.model).filter(self.model.id == id).first() is not None 
\ No newline at end of file
+        result = await self.db.execute(
+            select(literal(1)).where(self.model.id == id).limit(1)
+        )
+        return result.scalar() is not None
@@ -1,65 +1,113 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, bindparam, func, select
 
 from app.models.schemas import Claim
 from app.models.enums import ClaimStatus
+from app.cache import CLAIMS_CACHE_PREFIX
 from .base import BaseRepository
 
 class ClaimRepository(BaseRepository[Claim]):
-    def __init__(self, db: Session):
+    cache_prefix = "claim"
+    list_cache_prefix = CLAIMS_CACHE_PREFIX
+
+    def __init__(self, db: AsyncSession):
         super().__init__(Claim, db)
-    
-    def get_by_policy_number(self, policy_number: str) -> List[Claim]:
+
+    async def get_by_policy_number(self, policy_number: str) -> List[Claim]:
         """Get all claims for a specific policy number."""
-        return self.db.query(self.model).filter(
-            self.model.policy_number == policy_number
-        ).all()
-    
-    def get_by_status(self, status: ClaimStatus) -> List[Claim]:
+        statement = self._statement("by_policy_number", lambda: (
+            select(self.model).where(self.model.policy_number == bindparam("policy_number"))
+        ))
+        result = await self.db.execute(statement, {"policy_number": policy_number})
+        return list(result.scalars().all())
+
+    async def get_by_status(self, status: ClaimStatus) -> List[Claim]:
         """Get all claims with a specific status."""
-        return self.db.query(self.model).filter(
-            self.model.status == status
-        ).all()
-    
-    def get_by_policyholder(self, name: str) -> List[Claim]:
+        statement = self._statement("by_status", lambda: (
+            select(self.model).where(self.model.status == bindparam("status"))
+        ))
+        result = await self.db.execute(statement, {"status": status})
+        return list(result.scalars().all())
+
+    async def get_by_policyholder(self, name: str) -> List[Claim]:
         """Get all claims for a specific policyholder."""
-        return self.db.query(self.model).filter(
-            self.model.policyholder_name.ilike(f"%{name}%")
-        ).all()
-    
-    def get_with_filters(
+        result = await self.db.execute(
+            select(self.model).where(self.model.policyholder_name.ilike(f"%{name}%"))
+        )
+        return list(result.scalars().all())
+
+    async def get_with_filters(
         self,
         status: Optional[ClaimStatus] = None,
+        policy_number: Optional[str] = None,
         policyholder_name: Optional[str] = None,
         skip: int = 0,
         limit: int = 100
     ) -> List[Claim]:
-        """Get claims with multiple filters."""
-        query = self.db.query(self.model)
-        
+        """Get claims with multiple filters, newest first."""
+        query = select(self.model)
+
         if status:
-            query = query.filter(self.model.status == status)
+            query = query.where(self.model.status == status)
+        if policy_number:
+            query = query.where(self.model.policy_number == policy_number)
         if policyholder_name:
-            query = query.filter(self.model.policyholder_name.ilike(f"%{policyholder_name}%"))
-        
-        return query.offset(skip).limit(limit).all()
-    
-    def update_status(self, claim_id: UUID, status: ClaimStatus) -> Optional[Claim]:
+            query = query.where(self.model.policyholder_name.ilike(f"%{policyholder_name}%"))
+
+        query = query.order_by(self.model.created_at.desc()).offset(skip).limit(limit)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def update_status(self, claim_id: UUID, status: ClaimStatus) -> Optional[Claim]:
         """Update claim status."""
-        return self.update(claim_id, {"status": status})
-    
-    def get_with_video_analysis(self) -> List[Claim]:
+        return await self.update(claim_id, {"status": status})
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Get claim metrics in a single aggregate query."""
+        row = (await self.db.execute(
+            select(
+                func.count().label("total"),
+                func.coalesce(func.sum(self.model.total_amount), 0).label("total_amount"),
+                *(
+                    func.count().filter(self.model.status == status).label(status.value)
+                    for status in ClaimStatus
+                )
+            ).select_from(self.model)
+        )).one()._mapping
+
+        total = row["total"]
+        return {
+            "total_claims": total,
+            "total_claimed_amount": row["total_amount"],
+            "average_claim_amount": row["total_amount"] / total if total > 0 else 0,
+            "claims_by_status": {status.value: row[status.value] for status in ClaimStatus}
+        }
+
+    async def get_with_video_analysis(self) -> List[Claim]:
         """Get all claims that have video analysis results."""
-        return self.db.query(self.model).filter(
-            self.model.ml_processing_results.isnot(None)
-        ).all()
-    
-    def get_recent_claims(self, days: int = 30) -> List[Claim]:
-        """Get claims created in the last N days."""
-        from datetime import datetime, timedelta
+        result = await self.db.execute(
+            select(self.model).where(self.model.ml_processing_results.isnot(None))
+        )
+        return list(result.scalars().all())
+
+    async def get_recent_claims(
+        self,
+        days: int = 30,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+    ) -> List[Claim]:
+        """
+        Get a page of claims created in the last N days, newest first.
+
+        Pass the last row's `created_at` and `id` as `before` and `before_id`
+        to fetch the next page.
+        """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        return self.db.query(self.model).filter(
-            self.model.created_at >= cutoff_date
-        ).all() 
\ No newline at end of file
+        query = select(self.model).where(self.model.created_at >= cutoff_date)
+        query = self._keyset_page(query, limit, before, before_id)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
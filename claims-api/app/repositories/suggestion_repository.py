@@ -1,59 +1,100 @@
 from typing import List, Optional, Dict, Any
+from datetime import datetime
+import msgspec
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, func, select
 
-from app.models.schemas import AISuggestion
+from app.models.schemas import AISuggestion, SuggestedAction, SuggestionSummary, to_record
 from app.models.enums import SuggestionStatus, SuggestionType
+from app.cache import SUGGESTIONS_CACHE_PREFIX
 from .base import BaseRepository
 
 class SuggestionRepository(BaseRepository[AISuggestion]):
-    def __init__(self, db: Session):
+    cache_prefix = "suggestion"
+    list_cache_prefix = SUGGESTIONS_CACHE_PREFIX
+
+    def __init__(self, db: AsyncSession):
         super().__init__(AISuggestion, db)
-    
-    def get_by_claim(self, claim_id: UUID) -> List[AISuggestion]:
-        """Get all suggestions for a specific claim."""
-        return self.db.query(self.model).filter(
-            self.model.claim_id == claim_id
-        ).order_by(self.model.created_at.desc()).all()
-    
-    def get_by_status(self, status: SuggestionStatus) -> List[AISuggestion]:
+
+    async def get_by_claim(
+        self,
+        claim_id: UUID,
+        status: Optional[SuggestionStatus] = None,
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+    ) -> List[AISuggestion]:
+        """
+        Get a page of suggestions for a claim, newest first.
+
+        Pass the last row's `created_at` and `id` as `before` and `before_id`
+        to fetch the next page.
+        """
+        query = select(self.model).where(self.model.claim_id == claim_id)
+        if status:
+            query = query.where(self.model.status == status)
+        query = self._keyset_page(query, limit, before, before_id)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def delete_by_claim(self, claim_id: UUID) -> int:
+        """Delete all suggestions for a claim in one statement."""
+        result = await self.db.execute(
+            delete(self.model)
+            .where(self.model.claim_id == claim_id)
+            .returning(self.model.id)
+        )
+        deleted_ids = list(result.scalars().all())
+        await self.db.commit()
+        await self._invalidate(*deleted_ids)
+        return len(deleted_ids)
+
+    async def get_by_status(self, status: SuggestionStatus) -> List[AISuggestion]:
         """Get all suggestions with a specific status."""
-        return self.db.query(self.model).filter(
-            self.model.status == status
-        ).all()
-    
-    def get_by_type(self, type: SuggestionType) -> List[AISuggestion]:
+        statement = self._statement("by_status", lambda: (
+            select(self.model).where(self.model.status == bindparam("status"))
+        ))
+        result = await self.db.execute(statement, {"status": status})
+        return list(result.scalars().all())
+
+    async def get_by_type(self, type: SuggestionType) -> List[AISuggestion]:
         """Get all suggestions of a specific type."""
-        return self.db.query(self.model).filter(
-            self.model.type == type
-        ).all()
-    
-    def get_with_filters(
+        statement = self._statement("by_type", lambda: (
+            select(self.model).where(self.model.type == bindparam("type"))
+        ))
+        result = await self.db.execute(statement, {"type": type})
+        return list(result.scalars().all())
+
+    async def get_with_filters(
         self,
         claim_id: Optional[UUID] = None,
         status: Optional[SuggestionStatus] = None,
-        type: Optional[SuggestionType] = None
+        type: Optional[SuggestionType] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
     ) -> List[AISuggestion]:
-        """Get suggestions with multiple filters."""
-        query = self.db.query(self.model)
-        
+        """Get suggestions with multiple filters, newest first."""
+        query = select(self.model)
+
         if claim_id:
-            query = query.filter(self.model.claim_id == claim_id)
+            query = query.where(self.model.claim_id == claim_id)
         if status:
-            query = query.filter(self.model.status == status)
+            query = query.where(self.model.status == status)
         if type:
-            query = query.filter(self.model.type == type)
-        
-        return query.order_by(self.model.created_at.desc()).all()
-    
-    def update_status(
+            query = query.where(self.model.type == type)
+
+        query = query.order_by(self.model.created_at.desc()).offset(skip).limit(limit)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def update_status(
         self,
         suggestion_id: UUID,
         status: SuggestionStatus,
         reviewer_id: UUID,
         reviewer_notes: Optional[str] = None,
-        modified_action: Optional[str] = None
+        modified_action: Optional[SuggestedAction] = None
     ) -> Optional[AISuggestion]:
         """Update suggestion status and review information."""
         update_data = {
@@ -63,45 +104,61 @@ class SuggestionRepository(BaseRepository[AISuggestion]):
             "reviewed_at": func.now()
         }
         if modified_action:
-            update_data["suggested_action"] = modified_action
-        
-        return self.update(suggestion_id, update_data)
-    
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get suggestion metrics."""
-        total = self.db.query(func.count(self.model.id)).scalar()
-        
-        accepted = self.db.query(func.count(self.model.id)).filter(
-            self.model.status == SuggestionStatus.ACCEPTED
-        ).scalar()
-        
-        rejected = self.db.query(func.count(self.model.id)).filter(
-            self.model.status == SuggestionStatus.REJECTED
-        ).scalar()
-        
-        modified = self.db.query(func.count(self.model.id)).filter(
-            self.model.status == SuggestionStatus.MODIFIED
-        ).scalar()
-        
-        suggestions_by_type = self.db.query(
-            self.model.type,
-            func.count(self.model.id)
-        ).group_by(self.model.type).all()
-        
+            update_data["suggested_action"] = to_record(modified_action)
+
+        return await self.update(suggestion_id, update_data)
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Get suggestion metrics in a single aggregate query."""
+        rated_statuses = (
+            SuggestionStatus.ACCEPTED,
+            SuggestionStatus.REJECTED,
+            SuggestionStatus.MODIFIED
+        )
+        row = (await self.db.execute(
+            select(
+                func.count().label("total"),
+                *(
+                    func.count().filter(self.model.status == status).label(status.value)
+                    for status in rated_statuses
+                ),
+                *(
+                    func.count().filter(self.model.type == type).label(type.value)
+                    for type in SuggestionType
+                )
+            ).select_from(self.model)
+        )).one()._mapping
+
+        total = row["total"]
         return {
             "total_suggestions": total,
-            "acceptance_rate": accepted / total if total > 0 else 0,
-            "rejection_rate": rejected / total if total > 0 else 0,
-            "modification_rate": modified / total if total > 0 else 0,
-            "suggestions_by_type": suggestions_by_type
+            "acceptance_rate": row[SuggestionStatus.ACCEPTED.value] / total if total > 0 else 0,
+            "rejection_rate": row[SuggestionStatus.REJECTED.value] / total if total > 0 else 0,
+            "modification_rate": row[SuggestionStatus.MODIFIED.value] / total if total > 0 else 0,
+            # Only types that occur, as a GROUP BY would report them
+            "suggestions_by_type": {
+                type.value: row[type.value] for type in SuggestionType if row[type.value]
+            }
         }
-    
-    def get_high_confidence_suggestions(self, threshold: float = 0.8) -> List[AISuggestion]:
+
+    async def _get_summaries(self, *criteria) -> List[SuggestionSummary]:
+        # Select only the summary columns instead of hydrating full rows
+        result = await self.db.execute(
+            select(
+                self.model.id,
+                self.model.claim_id,
+                self.model.type,
+                self.model.confidence_score,
+                self.model.status,
+                self.model.created_at
+            ).where(*criteria)
+        )
+        return msgspec.convert(result.all(), List[SuggestionSummary], from_attributes=True)
+
+    async def get_high_confidence_suggestions(self, threshold: float = 0.8) -> List[SuggestionSummary]:
         """Get suggestions with confidence score above threshold."""
-        return self.db.query(self.model).filter(
-            self.model.confidence_score >= threshold
-        ).all()
-    
-    def get_pending_suggestions(self) -> List[AISuggestion]:
+        return await self._get_summaries(self.model.confidence_score >= threshold)
+
+    async def get_pending_suggestions(self) -> List[SuggestionSummary]:
         """Get all pending suggestions."""
-        return self.get_by_status(SuggestionStatus.PENDING) 
\ No newline at end of file
+        return await self._get_summaries(self.model.status == SuggestionStatus.PENDING)
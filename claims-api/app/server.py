@@ -0,0 +1,25 @@
+import os
+
+import uvicorn
+
+
+def get_worker_count() -> int:
+    """Worker processes to run; defaults to (2 * CPU cores) + 1."""
+    return int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+
+
+def main() -> None:
+    """Run the API with multiple workers on uvloop and httptools."""
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=get_worker_count(),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,67 @@
 from typing import List, Dict, Any
 from datetime import datetime
+import hashlib
 import uuid
 import os
-import json
-from openai import OpenAI
-from app.models.schemas import Claim, AISuggestion
+import httpx
+import msgspec
+from openai import AsyncOpenAI
+from app.cache import cache_get, cache_set
+from app.models.schemas import (
+    Claim,
+    AISuggestion,
+    SuggestedAction,
+    ApproveAction,
+    FlagFraudAction,
+    AdjustAmountAction,
+    to_record
+)
 from app.models.enums import SuggestionType, SuggestionStatus
 
+RESPONSE_CACHE_TTL = 86400  # seconds
+MAX_CONNECTIONS = 64  # Concurrent in-flight requests to the API per worker
+REQUEST_TIMEOUT = 60  # seconds
+MAX_RETRIES = 4  # Retried with exponential backoff on 429, 5xx and connection errors
+
+# Sent first and byte-identical on every call so the API can reuse its cached prefix
+_SYSTEM_PROMPT = """You are an expert insurance claims analyst. Analyze the provided claim data and generate detailed suggestions.
+Consider the following aspects:
+1. Claim amount and policy history
+2. Potential fraud indicators
+3. Individual item analysis
+4. Overall claim recommendation
+If 'video_analysis' field is provided, incorporate those findings into your suggestions.
+
+For each suggestion, provide:
+- Type of suggestion (approve_claim, deny_claim, adjust_amount, flag_fraud, replace_item, repair_item)
+- Description
+- Confidence score (0.0 to 1.0)
+- Detailed explanation
+- Specific suggested action, as an object with an "action" field
+
+Format your response as a JSON array of suggestions."""
+
 class AIService:
     def __init__(self):
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Initialize OpenAI client; one pooled HTTP client multiplexes all requests
+        self.client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+                timeout=REQUEST_TIMEOUT
+            ),
+            max_retries=MAX_RETRIES
+        )
         self.model_version = "gpt-4-turbo-preview"
         
-    def analyze_claim(self, claim: Claim) -> List[AISuggestion]:
+    def _response_cache_key(self, claim_payload: bytes) -> str:
+        # Model version and prompt are part of the key so changes don't replay old answers
+        digest = hashlib.sha256(
+            self.model_version.encode() + b"\0" + _SYSTEM_PROMPT.encode() + b"\0" + claim_payload
+        )
+        return f"llm:{digest.hexdigest()}"
+        
+    async def analyze_claim(self, claim: Claim) -> List[AISuggestion]:
         """
         Analyze a claim and generate AI suggestions using OpenAI.
         """
@@ -21,7 +69,7 @@ class AIService:
         claim_data = {
             "policy_number": claim.policy_number,
             "policyholder_name": claim.policyholder_name,
-            "date_of_loss": claim.date_of_loss.isoformat(),
+            "date_of_loss": claim.date_of_loss,
             "description": claim.description,
             "total_amount": claim.total_amount,
             "incident_location": claim.incident_location,
@@ -31,7 +79,7 @@ class AIService:
                     "description": item.description,
                     "category": item.category,
                     "estimated_value": item.estimated_value,
-                    "purchase_date": item.purchase_date.isoformat() if item.purchase_date else None,
+                    "purchase_date": item.purchase_date,
                     "replacement_cost": item.replacement_cost
                 }
                 for item in claim.items
@@ -39,58 +87,58 @@ class AIService:
         }
         # Include video analysis if available
         if getattr(claim, 'ml_processing_results', None):
-            claim_data['video_analysis'] = claim.ml_processing_results
+            claim_data['video_analysis'] = to_record(claim.ml_processing_results)
         
-        # Create the system prompt
-        system_prompt = """You are an expert insurance claims analyst. Analyze the provided claim data and generate detailed suggestions.
-        Consider the following aspects:
-        1. Claim amount and policy history
-        2. Potential fraud indicators
-        3. Individual item analysis
-        4. Overall claim recommendation
-        If 'video_analysis' field is provided, incorporate those findings into your suggestions.
-        
-        For each suggestion, provide:
-        - Type of suggestion (approve_claim, deny_claim, adjust_amount, flag_fraud, replace_item, repair_item)
-        - Description
-        - Confidence score (0.0 to 1.0)
-        - Detailed explanation
-        - Specific suggested action
-        
-        Format your response as a JSON array of suggestions."""
-
         try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model_version,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": json.dumps(claim_data, indent=2)}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent results
-                response_format={"type": "json_object"}
-            )
+            # Sorted keys give the same bytes for the same claim content, so an
+            # unchanged claim replays the cached response instead of calling the API
+            claim_payload = msgspec.json.encode(claim_data, order="sorted")
+            cache_key = self._response_cache_key(claim_payload)
+            content = await cache_get(cache_key, str)
+            is_cached = content is not None
+            if not is_cached:
+                # Call OpenAI API
+                response = await self.client.chat.completions.create(
+                    model=self.model_version,
+                    messages=[
+                        {"role": "system", "content": _SYSTEM_PROMPT},
+                        {"role": "user", "content": claim_payload.decode()}
+                    ],
+                    temperature=0.3,  # Lower temperature for more consistent results
+                    response_format={"type": "json_object"}
+                )
+                content = response.choices[0].message.content
             
             # Parse the AI response
-            ai_suggestions = json.loads(response.choices[0].message.content)
+            ai_suggestions = msgspec.json.decode(content)
+            
+            # One timestamp for the whole batch; they are created together
+            created_at = datetime.utcnow()
             
             # Convert AI suggestions to AISuggestion objects
             suggestions = []
             for suggestion_data in ai_suggestions["suggestions"]:
+                suggestion_type = SuggestionType(suggestion_data["type"])
                 suggestion = AISuggestion(
                     id=uuid.uuid4(),
                     claim_id=claim.id,
-                    type=SuggestionType(suggestion_data["type"]),
+                    type=suggestion_type,
                     description=suggestion_data["description"],
                     confidence_score=float(suggestion_data["confidence_score"]),
                     ai_explanation=suggestion_data["explanation"],
-                    suggested_action=suggestion_data["suggested_action"],
+                    suggested_action=msgspec.convert(
+                        {**suggestion_data["suggested_action"], "type": suggestion_type.value},
+                        SuggestedAction
+                    ),
                     status=SuggestionStatus.PENDING,
-                    created_at=datetime.utcnow(),
+                    created_at=created_at,
                     model_version=self.model_version
                 )
                 suggestions.append(suggestion)
             
+            # Only cache responses that parsed, so a bad answer isn't replayed
+            if not is_cached:
+                await cache_set(cache_key, content, RESPONSE_CACHE_TTL)
             return suggestions
             
         except Exception as e:
@@ -100,6 +148,7 @@ class AIService:
     def _fallback_analysis(self, claim: Claim) -> List[AISuggestion]:
         """Fallback to rule-based analysis if AI service fails"""
         suggestions = []
+        created_at = datetime.utcnow()
         
         # Basic amount analysis
         if claim.total_amount > 10000:
@@ -110,14 +159,14 @@ class AIService:
                 description="High-value claim detected",
                 confidence_score=0.85,
                 ai_explanation="Claim amount exceeds normal threshold",
-                suggested_action={
-                    "action": "review",
-                    "reason": "high_value",
-                    "threshold": 10000,
-                    "current_amount": claim.total_amount
-                },
+                suggested_action=AdjustAmountAction(
+                    action="review",
+                    reason="high_value",
+                    threshold=10000,
+                    current_amount=claim.total_amount
+                ),
                 status=SuggestionStatus.PENDING,
-                created_at=datetime.utcnow(),
+                created_at=created_at,
                 model_version="fallback-v1"
             ))
         
@@ -130,13 +179,13 @@ class AIService:
                 description="Potential fraud indicators detected",
                 confidence_score=0.75,
                 ai_explanation="Unusual claim characteristics detected",
-                suggested_action={
-                    "action": "investigate",
-                    "indicators": ["high_amount" if claim.total_amount > 50000 else "excessive_items"],
-                    "risk_level": "medium"
-                },
+                suggested_action=FlagFraudAction(
+                    action="investigate",
+                    indicators=["high_amount" if claim.total_amount > 50000 else "excessive_items"],
+                    risk_level="medium"
+                ),
                 status=SuggestionStatus.PENDING,
-                created_at=datetime.utcnow(),
+                created_at=created_at,
                 model_version="fallback-v1"
             ))
         
@@ -148,12 +197,12 @@ class AIService:
             description="Basic claim recommendation",
             confidence_score=0.80,
             ai_explanation="Initial review suggests approval pending detailed analysis",
-            suggested_action={
-                "action": "approve",
-                "total_amount": claim.total_amount
-            },
+            suggested_action=ApproveAction(
+                action="approve",
+                total_amount=claim.total_amount
+            ),
             status=SuggestionStatus.PENDING,
-            created_at=datetime.utcnow(),
+            created_at=created_at,
             model_version="fallback-v1"
         ))
         
@@ -1,8 +1,9 @@
-from typing import List, Optional, Dict, Any
+import os
+from typing import AsyncIterator, List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, timedelta
 
-from app.models.schemas import Claim, ClaimCreate, ClaimUpdate
+from app.models.schemas import Claim, ClaimCreate, ClaimUpdate, MLProcessingResults, to_record
 from app.models.enums import ClaimStatus
 from app.repositories.claim_repository import ClaimRepository
 from app.services.ai_service import AIService
@@ -19,20 +20,19 @@ class ClaimsService:
         self.ai_service = ai_service
         self.video_service = video_service
     
-    def create_claim(self, claim_data: ClaimCreate) -> Claim:
+    async def create_claim(self, claim_data: ClaimCreate) -> Claim:
         """Create a new claim."""
-        claim = self.claim_repository.create(claim_data.dict())
-        
-        # Generate AI suggestions for the new claim
-        self.ai_service.generate_suggestions(claim.id)
-        
-        return claim
+        return await self.claim_repository.create(to_record(claim_data))
     
-    def get_claim(self, claim_id: UUID) -> Optional[Claim]:
+    async def get_claim(self, claim_id: UUID) -> Optional[Claim]:
         """Get a claim by ID."""
-        return self.claim_repository.get(claim_id)
+        return await self.claim_repository.get(claim_id)
     
-    def get_claims(
+    async def claim_exists(self, claim_id: UUID) -> bool:
+        """Check whether a claim exists without loading it."""
+        return await self.claim_repository.exists(claim_id)
+    
+    async def get_claims(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -41,7 +41,7 @@ class ClaimsService:
         policyholder_name: Optional[str] = None
     ) -> List[Claim]:
         """Get claims with optional filters."""
-        return self.claim_repository.get_with_filters(
+        return await self.claim_repository.get_with_filters(
             skip=skip,
             limit=limit,
             status=status,
@@ -49,42 +49,54 @@ class ClaimsService:
             policyholder_name=policyholder_name
         )
     
-    def update_claim(self, claim_id: UUID, claim_data: ClaimUpdate) -> Optional[Claim]:
+    async def update_claim(self, claim_id: UUID, claim_data: ClaimUpdate) -> Optional[Claim]:
         """Update a claim."""
-        return self.claim_repository.update(claim_id, claim_data.dict(exclude_unset=True))
+        return await self.claim_repository.update(claim_id, to_record(claim_data))
     
-    def delete_claim(self, claim_id: UUID) -> bool:
+    async def delete_claim(self, claim_id: UUID) -> bool:
         """Delete a claim."""
-        return self.claim_repository.delete(claim_id)
+        return await self.claim_repository.delete(claim_id)
     
-    def update_claim_status(self, claim_id: UUID, status: ClaimStatus) -> Optional[Claim]:
+    async def update_claim_status(self, claim_id: UUID, status: ClaimStatus) -> Optional[Claim]:
         """Update claim status."""
-        return self.claim_repository.update_status(claim_id, status)
+        return await self.claim_repository.update_status(claim_id, status)
     
-    def get_claims_with_video_analysis(self) -> List[Claim]:
+    async def get_claims_with_video_analysis(self) -> List[Claim]:
         """Get claims that have video analysis results."""
-        return self.claim_repository.get_with_video_analysis()
+        return await self.claim_repository.get_with_video_analysis()
     
-    def get_recent_claims(self, days: int = 7) -> List[Claim]:
-        """Get claims created within the last N days."""
-        return self.claim_repository.get_recent_claims(days)
+    async def get_recent_claims(
+        self,
+        days: int = 7,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+    ) -> List[Claim]:
+        """Get a page of claims created within the last N days, newest first."""
+        return await self.claim_repository.get_recent_claims(days, limit, before, before_id)
     
-    def get_claim_metrics(self) -> Dict[str, Any]:
+    async def get_claim_metrics(self) -> Dict[str, Any]:
         """Get claim metrics."""
-        return self.claim_repository.get_metrics()
+        return await self.claim_repository.get_metrics()
     
-    def process_video_upload(self, claim_id: UUID, video_file: bytes) -> Dict[str, Any]:
+    async def process_video_upload(
+        self,
+        claim_id: UUID,
+        video_chunks: AsyncIterator[bytes]
+    ) -> MLProcessingResults:
         """Process a video upload for a claim."""
-        # Upload and analyze video
-        video_analysis = self.video_service.analyze_video(video_file)
+        # Stream the upload to disk, then analyze it from there
+        video_path = await self.video_service.save_video_stream(video_chunks, str(claim_id))
+        try:
+            video_analysis = await self.video_service.analyze_video(video_path)
+        finally:
+            # The analysis is all that is kept; don't leave uploads on disk
+            os.unlink(video_path)
         
         # Update claim with video analysis results
-        self.claim_repository.update(claim_id, {
-            "video_analysis": video_analysis,
+        await self.claim_repository.update(claim_id, {
+            "ml_processing_results": to_record(video_analysis),
             "has_video": True
         })
         
-        # Generate new suggestions based on video analysis
-        self.ai_service.generate_suggestions(claim_id)
-        
         return video_analysis 
\ No newline at end of file
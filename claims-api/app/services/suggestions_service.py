@@ -1,7 +1,16 @@
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from app.models.schemas import AISuggestion, SuggestionCreate, SuggestionUpdate
+from app.models.schemas import (
+    AISuggestion,
+    Claim,
+    SuggestedAction,
+    SuggestionCreate,
+    SuggestionSummary,
+    SuggestionUpdate,
+    to_record
+)
 from app.models.enums import SuggestionStatus, SuggestionType
 from app.repositories.suggestion_repository import SuggestionRepository
 from app.services.ai_service import AIService
@@ -14,78 +23,107 @@ class SuggestionsService:
     ):
         self.suggestion_repository = suggestion_repository
         self.ai_service = ai_service
-    
-    def create_suggestion(self, suggestion_data: SuggestionCreate) -> AISuggestion:
+
+    async def create_suggestion(self, suggestion_data: SuggestionCreate) -> AISuggestion:
         """Create a new suggestion."""
-        return self.suggestion_repository.create(suggestion_data.dict())
-    
-    def get_suggestion(self, suggestion_id: UUID) -> Optional[AISuggestion]:
+        return await self.suggestion_repository.create(to_record(suggestion_data))
+
+    async def generate_suggestions(self, claim: Claim) -> List[AISuggestion]:
+        """Generate AI suggestions for a claim and save them in one batch."""
+        # The suggestions carry their own ids and timestamps, so they are
+        # returned as generated instead of being read back after the insert
+        suggestions = await self.ai_service.analyze_claim(claim)
+        await self.suggestion_repository.bulk_create(
+            [to_record(suggestion) for suggestion in suggestions]
+        )
+        return suggestions
+
+    async def get_suggestion(self, suggestion_id: UUID) -> Optional[AISuggestion]:
         """Get a suggestion by ID."""
-        return self.suggestion_repository.get(suggestion_id)
-    
-    def get_suggestions(
+        return await self.suggestion_repository.get(suggestion_id)
+
+    async def get_claim_suggestions(
+        self,
+        claim_id: UUID,
+        status: Optional[SuggestionStatus] = None,
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+    ) -> List[AISuggestion]:
+        """Get a page of a claim's suggestions, newest first."""
+        return await self.suggestion_repository.get_by_claim(
+            claim_id,
+            status=status,
+            limit=limit,
+            before=before,
+            before_id=before_id
+        )
+
+    async def get_suggestions(
         self,
         claim_id: Optional[UUID] = None,
         status: Optional[SuggestionStatus] = None,
-        type: Optional[SuggestionType] = None
+        type: Optional[SuggestionType] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
     ) -> List[AISuggestion]:
-        """Get suggestions with optional filters."""
-        return self.suggestion_repository.get_with_filters(
+        """Get suggestions with optional filters and pagination."""
+        return await self.suggestion_repository.get_with_filters(
             claim_id=claim_id,
             status=status,
-            type=type
+            type=type,
+            skip=skip,
+            limit=limit
         )
-    
-    def update_suggestion(
+
+    async def update_suggestion(
         self,
         suggestion_id: UUID,
         suggestion_data: SuggestionUpdate
     ) -> Optional[AISuggestion]:
         """Update a suggestion."""
-        return self.suggestion_repository.update(
+        return await self.suggestion_repository.update(
             suggestion_id,
-            suggestion_data.dict(exclude_unset=True)
+            to_record(suggestion_data)
         )
-    
-    def delete_suggestion(self, suggestion_id: UUID) -> bool:
+
+    async def delete_suggestion(self, suggestion_id: UUID) -> bool:
         """Delete a suggestion."""
-        return self.suggestion_repository.delete(suggestion_id)
-    
-    def update_suggestion_status(
+        return await self.suggestion_repository.delete(suggestion_id)
+
+    async def update_suggestion_status(
         self,
         suggestion_id: UUID,
         status: SuggestionStatus,
         reviewer_id: UUID,
         reviewer_notes: Optional[str] = None,
-        modified_action: Optional[str] = None
+        modified_action: Optional[SuggestedAction] = None
     ) -> Optional[AISuggestion]:
         """Update suggestion status and review information."""
-        return self.suggestion_repository.update_status(
+        return await self.suggestion_repository.update_status(
             suggestion_id,
             status,
             reviewer_id,
             reviewer_notes,
             modified_action
         )
-    
-    def get_suggestion_metrics(self) -> Dict[str, Any]:
+
+    async def get_suggestion_metrics(self) -> Dict[str, Any]:
         """Get suggestion metrics."""
-        return self.suggestion_repository.get_metrics()
-    
-    def get_high_confidence_suggestions(self, threshold: float = 0.8) -> List[AISuggestion]:
+        return await self.suggestion_repository.get_metrics()
+
+    async def get_high_confidence_suggestions(self, threshold: float = 0.8) -> List[SuggestionSummary]:
         """Get suggestions with confidence score above threshold."""
-        return self.suggestion_repository.get_high_confidence_suggestions(threshold)
-    
-    def get_pending_suggestions(self) -> List[AISuggestion]:
+        return await self.suggestion_repository.get_high_confidence_suggestions(threshold)
+
+    async def get_pending_suggestions(self) -> List[SuggestionSummary]:
         """Get all pending suggestions."""
-        return self.suggestion_repository.get_pending_suggestions()
-    
-    def regenerate_suggestions(self, claim_id: UUID) -> List[AISuggestion]:
+        return await self.suggestion_repository.get_pending_suggestions()
+
+    async def regenerate_suggestions(self, claim: Claim) -> List[AISuggestion]:
         """Regenerate suggestions for a claim using AI."""
         # Delete existing suggestions for the claim
-        existing_suggestions = self.suggestion_repository.get_by_claim(claim_id)
-        for suggestion in existing_suggestions:
-            self.suggestion_repository.delete(suggestion.id)
-        
+        await self.suggestion_repository.delete_by_claim(claim.id)
+
         # Generate new suggestions
-        return self.ai_service.generate_suggestions(claim_id) 
\ No newline at end of file
+        return await self.generate_suggestions(claim)
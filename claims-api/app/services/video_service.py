@@ -1,15 +1,22 @@
 import os
-import tempfile
+import asyncio
+import base64
 from pathlib import Path
-from typing import Dict, Any
-from openai import OpenAI
-from moviepy.editor import VideoFileClip
+from typing import AsyncIterator
+from uuid import uuid4
+import aiofiles
+import cv2
+import msgspec
+from openai import AsyncOpenAI
+import av
+from av.container import InputContainer
 import magic
 from app.config import get_settings
+from app.models.schemas import MLProcessingResults
 
 class VideoService:
     def __init__(self):
-        self.client = OpenAI(api_key=get_settings().OPENAI_API_KEY)
+        self.client = AsyncOpenAI(api_key=get_settings().OPENAI_API_KEY)
         self.model_version = "gpt-4-vision-preview"
         self.allowed_mime_types = [
             "video/mp4",
@@ -19,12 +26,34 @@ class VideoService:
         ]
         self.max_video_size = 100 * 1024 * 1024  # 100MB
         self.max_video_duration = 300  # 5 minutes
+        self.frame_max_edge = 768  # Longest side of frames sent for analysis, in pixels
+        self.frame_jpeg_quality = 80
+        # Loading the magic database is costly, so do it once per service
+        self._mime = magic.Magic(mime=True)
         
     def validate_video(self, file_path: str) -> bool:
         """Validate video file type and size"""
+        self._validate_file(file_path)
+        with av.open(file_path) as container:
+            self._validate_duration(container)
+                
+        return True
+        
+    def extract_frames(self, video_path: str, num_frames: int = 5) -> list:
+        """Extract key frames from video for analysis"""
+        with av.open(video_path) as container:
+            return self._extract_frames(container, num_frames)
+        
+    def validate_and_extract_frames(self, video_path: str, num_frames: int = 5) -> list:
+        """Validate a video and extract its key frames, opening the file only once"""
+        self._validate_file(video_path)
+        with av.open(video_path) as container:
+            self._validate_duration(container)
+            return self._extract_frames(container, num_frames)
+        
+    def _validate_file(self, file_path: str) -> None:
         # Check file type
-        mime = magic.Magic(mime=True)
-        file_type = mime.from_file(file_path)
+        file_type = self._mime.from_file(file_path)
         if file_type not in self.allowed_mime_types:
             raise ValueError(f"Unsupported video format: {file_type}")
             
@@ -32,38 +61,72 @@ class VideoService:
         file_size = os.path.getsize(file_path)
         if file_size > self.max_video_size:
             raise ValueError(f"Video file too large. Maximum size is {self.max_video_size/1024/1024}MB")
-            
-        # Check video duration
-        with VideoFileClip(file_path) as video:
-            if video.duration > self.max_video_duration:
-                raise ValueError(f"Video too long. Maximum duration is {self.max_video_duration} seconds")
-                
-        return True
         
-    def extract_frames(self, video_path: str, num_frames: int = 5) -> list:
-        """Extract key frames from video for analysis"""
+    def _video_stream(self, container: InputContainer):
+        if not container.streams.video:
+            raise ValueError("Invalid video: no video stream")
+        return container.streams.video[0]
+        
+    def _duration(self, container: InputContainer) -> float:
+        if container.duration is not None:
+            return container.duration / av.time_base
+        stream = self._video_stream(container)
+        # Streamed or damaged files may carry no duration at all
+        if stream.duration is None:
+            raise ValueError("Invalid video: duration is unknown")
+        return float(stream.duration * stream.time_base)
+        
+    def _validate_duration(self, container: InputContainer) -> None:
+        if self._duration(container) > self.max_video_duration:
+            raise ValueError(f"Video too long. Maximum duration is {self.max_video_duration} seconds")
+        
+    def _extract_frames(self, container: InputContainer, num_frames: int) -> list:
+        stream = self._video_stream(container)
+        
+        # Calculate frame intervals
+        interval = self._duration(container) / (num_frames + 1)
+        
+        # Seek to the keyframe before each timestamp and decode the next frame,
+        # rather than decoding the whole video up to it
         frames = []
-        with VideoFileClip(video_path) as video:
-            # Calculate frame intervals
-            duration = video.duration
-            interval = duration / (num_frames + 1)
-            
-            # Extract frames at regular intervals
-            for i in range(1, num_frames + 1):
-                timestamp = i * interval
-                frame = video.get_frame(timestamp)
-                frames.append(frame)
-                
+        for i in range(1, num_frames + 1):
+            container.seek(int(i * interval / stream.time_base), stream=stream)
+            frame = next(container.decode(stream), None)
+            if frame is None:
+                raise ValueError("Invalid video: no frame at the requested position")
+            frames.append(frame.to_ndarray(format="rgb24"))
         return frames
         
-    def analyze_video(self, video_path: str) -> Dict[str, Any]:
+    def encode_frame(self, frame) -> str:
+        """Downscale an RGB frame and encode it as a base64 JPEG"""
+        height, width = frame.shape[:2]
+        scale = self.frame_max_edge / max(height, width)
+        if scale < 1:
+            frame = cv2.resize(
+                frame,
+                (round(width * scale), round(height * scale)),
+                interpolation=cv2.INTER_AREA
+            )
+        ok, buffer = cv2.imencode(
+            ".jpg",
+            cv2.cvtColor(frame, cv2.COLOR_RGB2BGR),
+            [int(cv2.IMWRITE_JPEG_QUALITY), self.frame_jpeg_quality]
+        )
+        if not ok:
+            raise ValueError("Could not encode video frame")
+        return base64.b64encode(buffer.tobytes()).decode("ascii")
+        
+    async def analyze_video(self, video_path: str) -> MLProcessingResults:
         """Analyze video content using OpenAI Vision API"""
+        # Decoding runs off the event loop: validate and extract frames in one
+        # pass over the file. Outside the try below, so a rejected video still
+        # raises ValueError for the caller to report as a bad request
+        frames = await asyncio.to_thread(self.validate_and_extract_frames, video_path)
         try:
-            # Validate video
-            self.validate_video(video_path)
-            
-            # Extract frames
-            frames = self.extract_frames(video_path)
+            # JPEG-encode the frames concurrently
+            encoded_frames = await asyncio.gather(
+                *(asyncio.to_thread(self.encode_frame, frame) for frame in frames)
+            )
             
             # Prepare messages for OpenAI
             messages = [
@@ -102,44 +165,51 @@ class VideoService:
             ]
             
             # Add frames to messages
-            for frame in frames:
+            for encoded_frame in encoded_frames:
                 messages.append({
                     "role": "user",
                     "content": [
                         {
-                            "type": "image",
+                            "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/jpeg;base64,{frame.tobytes()}"
+                                "url": f"data:image/jpeg;base64,{encoded_frame}"
                             }
                         }
                     ]
                 })
             
             # Call OpenAI API
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model_version,
                 messages=messages,
                 max_tokens=1000,
                 temperature=0.3
             )
             
-            # Parse and return analysis
-            return response.choices[0].message.content
+            # Parse and return analysis, tagged with the format version it follows
+            analysis = msgspec.json.decode(response.choices[0].message.content)
+            return msgspec.convert({**analysis, "version": "v1"}, MLProcessingResults)
             
         except Exception as e:
             raise Exception(f"Error analyzing video: {str(e)}")
             
-    def save_video(self, file_content: bytes, claim_id: str) -> str:
-        """Save uploaded video to temporary storage"""
-        # Create temporary directory if it doesn't exist
+    async def save_video_stream(self, chunks: AsyncIterator[bytes], claim_id: str) -> str:
+        """Stream an uploaded video to temporary storage chunk by chunk"""
         temp_dir = Path("temp/videos")
         temp_dir.mkdir(parents=True, exist_ok=True)
+        # Unique per upload, so concurrent uploads for a claim don't share a file
+        video_path = temp_dir / f"claim_{claim_id}_{uuid4().hex}.mp4"
         
-        # Generate unique filename
-        video_path = temp_dir / f"claim_{claim_id}_video.mp4"
-        
-        # Save video file
-        with open(video_path, "wb") as f:
-            f.write(file_content)
+        # Enforce the size limit while writing so oversized uploads stop early
+        size = 0
+        async with aiofiles.open(video_path, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > self.max_video_size:
+                    break
+                await f.write(chunk)
+        if size > self.max_video_size:
+            video_path.unlink(missing_ok=True)
+            raise ValueError(f"Video file too large. Maximum size is {self.max_video_size/1024/1024}MB")
             
-        return str(video_path) 
\ No newline at end of file
+        return str(video_path)
@@ -0,0 +1,31 @@
+import logging
+from uuid import UUID
+
+from app.database import SessionLocal
+from app.dependencies import get_ai_service
+from app.repositories.claim_repository import ClaimRepository
+from app.repositories.suggestion_repository import SuggestionRepository
+from app.services.suggestions_service import SuggestionsService
+
+logger = logging.getLogger(__name__)
+
+
+async def generate_claim_suggestions(claim_id: UUID) -> None:
+    """
+    Generate and store AI suggestions for a claim after the response is sent.
+
+    Runs as a background task. FastAPI tears yield dependencies down after
+    background tasks, so the request's session is still open here, but the
+    task opens its own from the factory rather than borrowing it: it runs in
+    the request's asyncio task, where SessionLocal() would return the
+    request's session. Clients poll the claim's suggestions.
+    """
+    try:
+        async with SessionLocal.session_factory() as db:
+            claim = await ClaimRepository(db).get(claim_id)
+            if claim is None:
+                return
+            suggestions_service = SuggestionsService(SuggestionRepository(db), get_ai_service())
+            await suggestions_service.generate_suggestions(claim)
+    except Exception:
+        logger.exception("Suggestion generation failed for claim %s", claim_id)
@@ -0,0 +1,6 @@
+from datetime import datetime
+
+# The tests' fixed clock, in the past: no per-test datetime calls, and any
+# timestamp the app writes during a test is guaranteed to differ from it.
+# Served to tests by the `now` fixture; factories use it directly
+NOW = datetime(2024, 1, 1, 12, 0, 0)
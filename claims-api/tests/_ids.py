@@ -0,0 +1,11 @@
+import itertools
+from uuid import UUID
+
+_counter = itertools.count(1)
+
+# The counter starts at 1, so no row created in a test ever has this id
+MISSING_ID = UUID(int=0)
+
+def next_uuid() -> UUID:
+    """Cheap, deterministic id for tests; only unique within a test run."""
+    return UUID(int=next(_counter))
@@ -1,15 +1,25 @@
+import asyncio
+import os
+import httpx
+import msgspec
 import pytest
+import pytest_asyncio
+from types import MappingProxyType
 from typing import Generator, Dict
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
-from uuid import uuid4
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
+# Read by the settings when the app is imported below
+os.environ.setdefault("DISABLE_OPENAPI", "true")
+
+from app import cache
 from app.main import app
-from app.database import Base, get_db
+from app.api.routes import claims as claims_routes
+from app.database import Base, get_db, get_engine
+from app.dependencies import get_ai_service, get_video_service
 from app.models.schemas import Claim, AISuggestion
 from app.models.enums import ClaimStatus, SuggestionStatus, SuggestionType
 from app.repositories.claim_repository import ClaimRepository
@@ -18,43 +28,123 @@ from app.services.claims_service import ClaimsService
 from app.services.suggestions_service import SuggestionsService
 from app.services.ai_service import AIService
 from app.services.video_service import VideoService
+from pytest_factoryboy import register
+
+from factories import ClaimFactory, ClaimDataFactory, SuggestionDataFactory
+from _clock import NOW
+from _ids import next_uuid
+
+# Provides claim_factory, claim_data_factory and suggestion_data_factory fixtures
+register(ClaimFactory)
+register(ClaimDataFactory)
+register(SuggestionDataFactory)
+
+# Test database setup: in memory, so CRUD in tests never touches the disk
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# One shared connection for the whole run, reused by every test session;
+# an in-memory database lives only as long as its connection
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+# pysqlite-style drivers manage BEGIN themselves, which breaks SAVEPOINT;
+# hand transaction control back to SQLAlchemy
+@event.listens_for(engine.sync_engine, "connect")
+def _disable_driver_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine.sync_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+class FakeRedis:
+    """In-memory stand-in for the Redis client, covering the calls app.cache makes."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
 
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    # Redis isn't rolled back with the test's SAVEPOINT, so every test gets an
+    # empty cache of its own; nothing leaks between tests or xdist workers,
+    # and no test waits on a Redis connection
+    redis = FakeRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: redis)
+    return redis
 
 @pytest.fixture(scope="session")
-def db_engine():
-    Base.metadata.create_all(bind=engine)
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="session")
+async def db_engine():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     yield engine
-    Base.metadata.drop_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
 
-@pytest.fixture(scope="function")
-def db_session(db_engine):
-    connection = db_engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
-    
-    yield session
-    
-    session.close()
-    transaction.rollback()
-    connection.close()
+@pytest_asyncio.fixture(scope="function")
+async def db_session(db_engine):
+    # Everything a test does, commits included, happens inside one outer
+    # transaction: the session's commits only release SAVEPOINTs, and the
+    # rollback afterwards leaves the schema empty for the next test
+    async with db_engine.connect() as connection:
+        transaction = await connection.begin()
+        session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+        
+        yield session
+        
+        await session.close()
+        await transaction.rollback()
+
+@pytest_asyncio.fixture(scope="session")
+async def app_client():
+    # One client and pooled ASGI transport for the whole session, running the
+    # app on the test event loop alongside the test's database session
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test"
+    ) as test_client:
+        yield test_client
 
 @pytest.fixture(scope="function")
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+def client(app_client, db_session):
+    async def override_get_db():
+        yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
+    yield app_client
     app.dependency_overrides.clear()
 
+@pytest.fixture
+def engine_override(db_engine):
+    # Endpoints that check the database itself get the test engine; use with
+    # app_client rather than client, whose session would hold the engine's
+    # only connection in an open transaction
+    app.dependency_overrides[get_engine] = lambda: db_engine
+    yield db_engine
+    app.dependency_overrides.pop(get_engine, None)
+
 @pytest.fixture(scope="function")
 def claim_repository(db_session):
     return ClaimRepository(db_session)
@@ -63,14 +153,53 @@ def claim_repository(db_session):
 def suggestion_repository(db_session):
     return SuggestionRepository(db_session)
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def mock_ai_service():
     return Mock(spec=AIService)
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def mock_video_service():
     return Mock(spec=VideoService)
 
+@pytest.fixture
+def ai_service_override(mock_ai_service):
+    # The app gets its AIService from the cached get_ai_service dependency,
+    # so serve the shared mock through it rather than patching the class
+    app.dependency_overrides[get_ai_service] = lambda: mock_ai_service
+    yield mock_ai_service
+    app.dependency_overrides.pop(get_ai_service, None)
+
+@pytest.fixture
+def video_service_override(mock_video_service):
+    # Same for the cached get_video_service dependency
+    app.dependency_overrides[get_video_service] = lambda: mock_video_service
+    yield mock_video_service
+    app.dependency_overrides.pop(get_video_service, None)
+
+@pytest.fixture
+def mocked_services(video_service_override, tmp_path, monkeypatch):
+    """Serve a mock video service to uploads and stub the suggestion task they schedule."""
+    # The upload is deleted after analysis, so the mock hands back a real file
+    video_path = tmp_path / "test_video.mp4"
+    video_path.write_bytes(b"fake video content")
+    video_service_override.save_video_stream.return_value = str(video_path)
+    video_service_override.analyze_video.return_value = {"damage": "severe"}
+    
+    # The background task builds its own AI service and session; it is
+    # covered by its own test, here it only needs to be scheduled
+    generate_suggestions = AsyncMock()
+    monkeypatch.setattr(claims_routes, "generate_claim_suggestions", generate_suggestions)
+    
+    return video_service_override, generate_suggestions
+
+@pytest.fixture(autouse=True)
+def _reset_service_mocks(mock_ai_service, mock_video_service):
+    # The mocks are shared across a module; clear calls and configured
+    # return values after each test so assertions stay per-test
+    yield
+    mock_ai_service.reset_mock(return_value=True, side_effect=True)
+    mock_video_service.reset_mock(return_value=True, side_effect=True)
+
 @pytest.fixture(scope="function")
 def claims_service(claim_repository, mock_ai_service, mock_video_service):
     return ClaimsService(claim_repository, mock_ai_service, mock_video_service)
@@ -79,60 +208,124 @@ def claims_service(claim_repository, mock_ai_service, mock_video_service):
 def suggestions_service(suggestion_repository, mock_ai_service):
     return SuggestionsService(suggestion_repository, mock_ai_service)
 
-@pytest.fixture
-def sample_claim(db_session):
+@pytest.fixture(scope="session")
+def now() -> datetime:
+    return NOW
+
+@pytest_asyncio.fixture
+async def sample_claim(db_session, now):
     claim = Claim(
-        id=uuid4(),
+        id=next_uuid(),
         policy_number="POL123",
         policyholder_name="John Doe",
-        loss_date=datetime.utcnow(),
+        loss_date=now,
         loss_description="Water damage in kitchen",
         loss_amount=5000.00,
         incident_location="123 Main St",
         status=ClaimStatus.SUBMITTED,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now
     )
     db_session.add(claim)
-    db_session.commit()
-    db_session.refresh(claim)
+    await db_session.commit()
+    await db_session.refresh(claim)
     return claim
 
-@pytest.fixture
-def sample_suggestion(db_session, sample_claim):
+@pytest_asyncio.fixture
+async def sample_suggestion(db_session, sample_claim, now):
     suggestion = AISuggestion(
-        id=uuid4(),
+        id=next_uuid(),
         claim_id=sample_claim.id,
         type=SuggestionType.INVESTIGATION,
         confidence_score=0.95,
         explanation="High confidence in damage assessment",
         suggested_action="Schedule inspection",
         status=SuggestionStatus.PENDING,
-        created_at=datetime.utcnow()
+        created_at=now
     )
     db_session.add(suggestion)
-    db_session.commit()
-    db_session.refresh(suggestion)
+    await db_session.commit()
+    await db_session.refresh(suggestion)
     return suggestion
 
 @pytest.fixture
-def sample_claim_data():
-    return {
+def reviewed_suggestion_factory(db_session, sample_claim, now):
+    # Inserts suggestions already in a reviewed state, skipping the review endpoint
+    async def make(**overrides):
+        fields = dict(
+            id=next_uuid(),
+            claim_id=sample_claim.id,
+            type=SuggestionType.INVESTIGATION,
+            confidence_score=0.95,
+            explanation="High confidence in damage assessment",
+            suggested_action="Schedule inspection",
+            status=SuggestionStatus.ACCEPTED,
+            reviewer_id=str(next_uuid()),
+            reviewer_notes="Looks good",
+            reviewed_at=now,
+            created_at=now
+        )
+        fields.update(overrides)
+        suggestion = AISuggestion(**fields)
+        db_session.add(suggestion)
+        await db_session.commit()
+        await db_session.refresh(suggestion)
+        return suggestion
+
+    return make
+
+@pytest_asyncio.fixture
+async def reviewed_suggestion(reviewed_suggestion_factory):
+    return await reviewed_suggestion_factory()
+
+@pytest_asyncio.fixture
+async def seeded_claim(claim_repository, sample_claim_data):
+    # Inserted through the repository, for tests of what happens to an existing claim
+    return await claim_repository.create(sample_claim_data)
+
+# Shared by every test, so handed out read-only; merge into a new dict
+# ({**sample_claim_data, ...}) to vary fields
+@pytest.fixture(scope="session")
+def sample_claim_data(now):
+    return MappingProxyType({
         "policy_number": "POL-123",
         "policyholder_name": "John Doe",
-        "incident_date": datetime.now().isoformat(),
-        "incident_description": "Test incident",
-        "damage_description": "Test damage",
+        "date_of_loss": now.isoformat(),
+        "description": "Test incident",
+        "total_amount": 5000.00,
+        "incident_location": {
+            "street": "123 Main St",
+            "city": "Springfield",
+            "state": "IL",
+            "zipcode": "62701",
+            "country": "US"
+        },
+        "items": [],
         "status": ClaimStatus.SUBMITTED.value
-    }
+    })
 
-@pytest.fixture
-def sample_suggestion_data():
-    return {
-        "claim_id": str(uuid4()),
-        "type": SuggestionType.DAMAGE_ASSESSMENT.value,
-        "content": "Test suggestion",
-        "confidence": 0.95,
+@pytest.fixture(scope="session")
+def sample_suggestion_data(now):
+    return MappingProxyType({
+        "claim_id": str(next_uuid()),
+        "type": SuggestionType.REQUEST_INFO.value,
+        "description": "Test suggestion",
+        "confidence_score": 0.95,
+        "ai_explanation": "Photos of the damage are missing",
+        "suggested_action": {
+            "type": SuggestionType.REQUEST_INFO.value,
+            "action": "Request photos of the damage"
+        },
+        "model_version": "test",
         "status": SuggestionStatus.PENDING.value,
-        "created_at": datetime.now().isoformat()
-    } 
\ No newline at end of file
+        "created_at": now.isoformat()
+    })
+
+# Request bodies for the sample payloads, encoded once per session
+@pytest.fixture(scope="session")
+def sample_claim_body(sample_claim_data) -> bytes:
+    return msgspec.json.encode(dict(sample_claim_data))
+
+@pytest.fixture(scope="session")
+def sample_suggestion_body(sample_suggestion_data) -> bytes:
+    return msgspec.json.encode(dict(sample_suggestion_data))
@@ -0,0 +1,77 @@
+import factory
+from pytest_factoryboy import named_model
+
+from app.models.schemas import Address, Claim, ClaimItem, RequestInfoAction, to_record
+from app.models.enums import ClaimStatus, SuggestionStatus, SuggestionType
+from _clock import NOW
+from _ids import next_uuid
+
+class AddressFactory(factory.Factory):
+    class Meta:
+        model = Address
+
+    street = "123 Main St"
+    city = "Springfield"
+    state = "IL"
+    zipcode = "62701"
+    country = "US"
+
+class ClaimItemFactory(factory.Factory):
+    class Meta:
+        model = ClaimItem
+
+    name = "Kitchen cabinets"
+    description = "Water damaged lower cabinets"
+    category = "fixtures"
+    estimated_value = 5000.00
+
+class ClaimFactory(factory.Factory):
+    class Meta:
+        model = Claim
+
+    id = factory.LazyFunction(next_uuid)
+    policy_number = factory.Sequence(lambda n: f"POL-{n}")
+    policyholder_name = "John Doe"
+    date_of_loss = NOW
+    description = "Water damage in kitchen"
+    total_amount = 5000.00
+    incident_location = factory.SubFactory(AddressFactory)
+    items = factory.List([factory.SubFactory(ClaimItemFactory)])
+    status = ClaimStatus.SUBMITTED
+    created_at = NOW
+    updated_at = NOW
+
+# Repositories take plain dicts, so rows to insert are built as dicts. The
+# models are named so pytest-factoryboy doesn't register a `dict` fixture,
+# which would shadow the builtin in every test and fixture
+
+class ClaimDataFactory(factory.DictFactory):
+    class Meta:
+        model = named_model(dict, "ClaimData")
+
+    policy_number = factory.Sequence(lambda n: f"POL-{n}")
+    policyholder_name = "John Doe"
+    date_of_loss = NOW
+    description = "Water damage in kitchen"
+    total_amount = 5000.00
+    # Nested values as the builtins `to_record` produces
+    incident_location = factory.LazyFunction(lambda: to_record(AddressFactory()))
+    items = factory.LazyFunction(lambda: [to_record(ClaimItemFactory())])
+    status = ClaimStatus.SUBMITTED
+
+class SuggestionDataFactory(factory.DictFactory):
+    class Meta:
+        model = named_model(dict, "SuggestionData")
+
+    claim_id = factory.LazyFunction(next_uuid)
+    type = SuggestionType.REQUEST_INFO
+    description = "Test suggestion"
+    confidence_score = 0.95
+    ai_explanation = "Photos of the damage are missing"
+    suggested_action = factory.LazyFunction(lambda: to_record(RequestInfoAction(
+        action="Request photos of the damage",
+        requested_information=["photos"]
+    )))
+    model_version = "test"
+    status = SuggestionStatus.PENDING
+    created_at = NOW
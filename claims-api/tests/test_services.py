@@ -1,150 +1,170 @@
+import msgspec
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import os
-from datetime import datetime
-from uuid import uuid4
+from types import SimpleNamespace
 
+from app import cache, tasks
 from app.services.ai_service import AIService
 from app.services.video_service import VideoService
-from app.models.schemas import Claim, AISuggestion
+from app.models.schemas import Claim, AISuggestion, RequestInfoAction, VideoAnalysisV1
 from app.models.enums import SuggestionType, SuggestionStatus, ClaimStatus
 from app.services.claims_service import ClaimsService
 from app.services.suggestions_service import SuggestionsService
+from factories import ClaimFactory
+from _ids import next_uuid
+
+# Canned model replies, built once at import
+_ANALYSIS_ACTION = RequestInfoAction(
+    action="Schedule inspection",
+    requested_information=["inspection report"]
+)
+
+_ANALYSIS_CONTENT = msgspec.json.encode({
+    "suggestions": [{
+        "type": SuggestionType.REQUEST_INFO,
+        "description": "Inspect the kitchen",
+        "confidence_score": 0.95,
+        "explanation": "High confidence in damage assessment",
+        "suggested_action": _ANALYSIS_ACTION
+    }]
+}).decode()
+
+_VIDEO_ANALYSIS_CONTENT = msgspec.json.encode({
+    "suggestions": [{
+        "type": SuggestionType.REQUEST_INFO,
+        "description": "Inspect the kitchen and living room",
+        "confidence_score": 0.98,
+        "explanation": "Video confirms severe damage",
+        "suggested_action": RequestInfoAction(action="Immediate inspection required")
+    }]
+}).decode()
+
+def _completion(content: str) -> SimpleNamespace:
+    """Shape a reply like the chat completions response the client returns."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
 
 class TestAIService:
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def ai_service(self):
         return AIService()
     
-    @pytest.fixture
+    # Claim is a frozen Struct; tests derive variants with msgspec.structs.replace
+    @pytest.fixture(scope="module")
     def sample_claim(self):
-        return Claim(
-            id=uuid4(),
-            policy_number="POL123",
-            policyholder_name="John Doe",
-            loss_date=datetime.utcnow(),
-            loss_description="Water damage in kitchen",
-            loss_amount=5000.00,
-            incident_location="123 Main St",
-            status="SUBMITTED",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
+        return ClaimFactory(policy_number="POL123")
+    
+    @pytest.fixture(scope="module")
+    def openai_mock_response(self):
+        return _completion(_ANALYSIS_CONTENT)
     
-    def test_analyze_claim(self, ai_service, sample_claim, mocker):
-        # Mock OpenAI API call
-        mock_openai = mocker.patch("openai.ChatCompletion.create")
-        mock_openai.return_value = {
-            "choices": [{
-                "message": {
-                    "content": """
-                    {
-                        "suggestions": [
-                            {
-                                "type": "INVESTIGATION",
-                                "confidence_score": 0.95,
-                                "explanation": "High confidence in damage assessment",
-                                "suggested_action": "Schedule inspection"
-                            }
-                        ]
-                    }
-                    """
-                }
-            }]
-        }
+    @pytest.fixture(scope="module")
+    def openai_video_mock_response(self):
+        return _completion(_VIDEO_ANALYSIS_CONTENT)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_claim(self, ai_service, sample_claim, openai_mock_response, mocker):
+        # Mock OpenAI API call; the client awaits it
+        create = mocker.patch.object(
+            ai_service.client.chat.completions, "create",
+            new_callable=AsyncMock, return_value=openai_mock_response
+        )
         
-        suggestions = ai_service.analyze_claim(sample_claim)
+        suggestions = await ai_service.analyze_claim(sample_claim)
+        create.assert_awaited_once()
         assert len(suggestions) == 1
         suggestion = suggestions[0]
         assert isinstance(suggestion, AISuggestion)
-        assert suggestion.type == SuggestionType.INVESTIGATION
+        assert suggestion.type == SuggestionType.REQUEST_INFO
+        assert suggestion.suggested_action == _ANALYSIS_ACTION
         assert suggestion.confidence_score == 0.95
         assert suggestion.claim_id == sample_claim.id
         assert suggestion.status == SuggestionStatus.PENDING
     
-    def test_analyze_claim_with_video(self, ai_service, sample_claim, mocker):
+    @pytest.mark.asyncio
+    async def test_analyze_claim_with_video(
+        self, ai_service, sample_claim, openai_video_mock_response, mocker
+    ):
         # Add video analysis results to claim
-        sample_claim.ml_processing_results = {
+        sample_claim = msgspec.structs.replace(sample_claim, ml_processing_results={
             "damage_severity": "severe",
             "affected_areas": ["kitchen", "living_room"]
-        }
+        })
         
-        # Mock OpenAI API call
-        mock_openai = mocker.patch("openai.ChatCompletion.create")
-        mock_openai.return_value = {
-            "choices": [{
-                "message": {
-                    "content": """
-                    {
-                        "suggestions": [
-                            {
-                                "type": "INVESTIGATION",
-                                "confidence_score": 0.98,
-                                "explanation": "Video confirms severe damage",
-                                "suggested_action": "Immediate inspection required"
-                            }
-                        ]
-                    }
-                    """
-                }
-            }]
-        }
+        # Mock OpenAI API call; the client awaits it
+        create = mocker.patch.object(
+            ai_service.client.chat.completions, "create",
+            new_callable=AsyncMock, return_value=openai_video_mock_response
+        )
         
-        suggestions = ai_service.analyze_claim(sample_claim)
+        suggestions = await ai_service.analyze_claim(sample_claim)
+        create.assert_awaited_once()
         assert len(suggestions) == 1
         suggestion = suggestions[0]
         assert suggestion.confidence_score == 0.98
-        assert "video" in suggestion.explanation.lower()
+        assert "video" in suggestion.ai_explanation.lower()
 
 class TestVideoService:
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def video_service(self):
         return VideoService()
     
-    def test_save_video(self, video_service, tmp_path):
-        # Create a temporary video file
-        video_content = b"fake video content"
-        video_path = video_service.save_video(video_content, "test_claim")
-        
-        assert os.path.exists(video_path)
-        with open(video_path, "rb") as f:
-            saved_content = f.read()
-        assert saved_content == video_content
-    
-    def test_analyze_video(self, video_service, mocker):
-        # Mock OpenAI Vision API call
-        mock_openai = mocker.patch("openai.ChatCompletion.create")
-        mock_openai.return_value = {
-            "choices": [{
-                "message": {
-                    "content": """
-                    {
-                        "damage_severity": "severe",
-                        "affected_areas": ["kitchen", "living_room"],
-                        "estimated_repair_cost": 15000
-                    }
-                    """
-                }
-            }]
-        }
-        
-        # Create a temporary video file
-        video_path = "/tmp/test_video.mp4"
-        with open(video_path, "wb") as f:
-            f.write(b"fake video content")
+    @pytest.mark.asyncio
+    async def test_save_video_stream(self, video_service):
+        async def chunks():
+            yield b"fake video "
+            yield b"content"
         
+        video_path = await video_service.save_video_stream(chunks(), "test_claim")
         try:
-            analysis = video_service.analyze_video(video_path)
-            assert "damage_severity" in analysis
-            assert "affected_areas" in analysis
-            assert "estimated_repair_cost" in analysis
-            assert analysis["damage_severity"] == "severe"
-            assert len(analysis["affected_areas"]) == 2
+            with open(video_path, "rb") as f:
+                assert f.read() == b"fake video content"
         finally:
-            if os.path.exists(video_path):
-                os.remove(video_path)
+            os.unlink(video_path)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_video(self, video_service, tmp_path, mocker):
+        # Mock OpenAI Vision API call with a reply in the v1 analysis format;
+        # the client awaits it
+        create = mocker.patch.object(
+            video_service.client.chat.completions,
+            "create",
+            new_callable=AsyncMock,
+            return_value=_completion(msgspec.json.encode({
+                "damage_assessment": {
+                    "visible_damage": ["water stains", "warped flooring"],
+                    "severity": "high",
+                    "confidence": 0.9
+                },
+                "property_condition": {"overall_state": "fair"},
+                "fraud_indicators": {"risk_level": "low"}
+            }).decode())
+        )
+        # Frame extraction is stubbed, so the video file is never opened or written
+        mocker.patch.object(video_service, "validate_and_extract_frames", return_value=[])
+        video_path = str(tmp_path / "test_video.mp4")
+        
+        analysis = await video_service.analyze_video(video_path)
+        create.assert_awaited_once()
+        assert isinstance(analysis, VideoAnalysisV1)
+        assert analysis.damage_assessment.severity == "high"
+        assert len(analysis.damage_assessment.visible_damage) == 2
+        assert analysis.property_condition.overall_state == "fair"
+        assert analysis.fraud_indicators.risk_level == "low"
+        assert analysis.evidence_quality is None
     
-    def test_validate_video(self, video_service):
+    @pytest.mark.asyncio
+    async def test_analyze_video_rejects_invalid_video(self, video_service, tmp_path, mocker):
+        # Validation errors reach the caller as ValueError, which the upload route maps to 400
+        mocker.patch.object(
+            video_service,
+            "validate_and_extract_frames",
+            side_effect=ValueError("Unsupported video format: text/plain")
+        )
+        with pytest.raises(ValueError, match="Unsupported video format"):
+            await video_service.analyze_video(str(tmp_path / "test_video.mp4"))
+    
+    def test_validate_video(self, video_service, tmp_path, mocker):
         # Test valid video
         valid_video = b"fake video content"
         assert video_service.validate_video(valid_video, "test.mp4")
@@ -152,11 +172,17 @@ class TestVideoService:
         # Test invalid file type
         assert not video_service.validate_video(valid_video, "test.txt")
         
-        # Test file too large
-        large_video = b"x" * (101 * 1024 * 1024)  # 101MB
-        assert not video_service.validate_video(large_video, "test.mp4")
+        # Test file too large: the size check only stats the file, so a sparse
+        # 101MB file is enough and nothing is allocated or written
+        large_video = tmp_path / "large.mp4"
+        with open(large_video, "wb") as f:
+            f.truncate(101 * 1024 * 1024)
+        mocker.patch.object(video_service._mime, "from_file", return_value="video/mp4")
+        with pytest.raises(ValueError, match="too large"):
+            video_service.validate_video(str(large_video))
 
-def test_claims_service_create_claim(
+@pytest.mark.asyncio
+async def test_claims_service_create_claim(
     claims_service: ClaimsService,
     sample_claim_data: dict,
     mock_ai_service: Mock
@@ -173,7 +199,7 @@ def test_claims_service_create_claim(
     }
     
     # Create claim
-    claim = claims_service.create_claim(sample_claim_data)
+    claim = await claims_service.create_claim(dict(sample_claim_data))
     
     # Verify claim creation
     assert claim.id is not None
@@ -183,44 +209,43 @@ def test_claims_service_create_claim(
     # Verify AI service was called
     mock_ai_service.analyze_claim.assert_called_once_with(claim)
 
-def test_claims_service_get_claim(claims_service: ClaimsService, sample_claim_data: dict):
-    # Create a claim
-    created_claim = claims_service.create_claim(sample_claim_data)
-    
+@pytest.mark.asyncio
+async def test_claims_service_get_claim(
+    claims_service: ClaimsService,
+    seeded_claim: Claim,
+    sample_claim_data: dict
+):
     # Get the claim
-    retrieved_claim = claims_service.get_claim(created_claim.id)
+    retrieved_claim = await claims_service.get_claim(seeded_claim.id)
     
     # Verify claim retrieval
     assert retrieved_claim is not None
-    assert retrieved_claim.id == created_claim.id
+    assert retrieved_claim.id == seeded_claim.id
     assert retrieved_claim.policy_number == sample_claim_data["policy_number"]
 
-def test_claims_service_update_claim(claims_service: ClaimsService, sample_claim_data: dict):
-    # Create a claim
-    created_claim = claims_service.create_claim(sample_claim_data)
-    
+@pytest.mark.asyncio
+async def test_claims_service_update_claim(claims_service: ClaimsService, seeded_claim: Claim):
     # Update the claim
     update_data = {"policyholder_name": "Jane Doe"}
-    updated_claim = claims_service.update_claim(created_claim.id, update_data)
+    updated_claim = await claims_service.update_claim(seeded_claim.id, update_data)
     
     # Verify claim update
     assert updated_claim is not None
-    assert updated_claim.id == created_claim.id
+    assert updated_claim.id == seeded_claim.id
     assert updated_claim.policyholder_name == "Jane Doe"
 
-def test_claims_service_delete_claim(claims_service: ClaimsService, sample_claim_data: dict):
-    # Create a claim
-    created_claim = claims_service.create_claim(sample_claim_data)
-    
+@pytest.mark.asyncio
+async def test_claims_service_delete_claim(claims_service: ClaimsService, seeded_claim: Claim):
     # Delete the claim
-    assert claims_service.delete_claim(created_claim.id) is True
+    assert await claims_service.delete_claim(seeded_claim.id) is True
     
     # Verify claim deletion
-    assert claims_service.get_claim(created_claim.id) is None
+    assert await claims_service.get_claim(seeded_claim.id) is None
 
-def test_claims_service_process_video(
+@pytest.mark.asyncio
+async def test_claims_service_process_video(
     claims_service: ClaimsService,
-    sample_claim_data: dict,
+    seeded_claim: Claim,
     mock_video_service: Mock
 ):
     # Mock video service response
@@ -230,12 +255,9 @@ def test_claims_service_process_video(
         "confidence": 0.95
     }
     
-    # Create a claim
-    claim = claims_service.create_claim(sample_claim_data)
-    
     # Process video
     video_data = b"test video data"
-    result = claims_service.process_video(claim.id, video_data)
+    result = await claims_service.process_video(seeded_claim.id, video_data)
     
     # Verify video processing
     assert result is not None
@@ -245,47 +267,49 @@ def test_claims_service_process_video(
     # Verify video service was called
     mock_video_service.analyze_video.assert_called_once_with(video_data)
 
-def test_suggestions_service_get_suggestions(
+@pytest.mark.asyncio
+async def test_suggestions_service_get_suggestions(
     suggestions_service: SuggestionsService,
     sample_suggestion_data: dict
 ):
     # Create test suggestions
-    claim_id = uuid4()
-    suggestion1 = suggestions_service.create_suggestion({
+    claim_id = next_uuid()
+    suggestion1 = await suggestions_service.create_suggestion({
         **sample_suggestion_data,
         "claim_id": claim_id,
         "type": SuggestionType.DAMAGE_ASSESSMENT
     })
-    suggestion2 = suggestions_service.create_suggestion({
+    suggestion2 = await suggestions_service.create_suggestion({
         **sample_suggestion_data,
         "claim_id": claim_id,
         "type": SuggestionType.FRAUD_DETECTION
     })
     
     # Get suggestions
-    suggestions = suggestions_service.get_suggestions(claim_id)
+    suggestions = await suggestions_service.get_suggestions(claim_id)
     
     # Verify suggestions retrieval
     assert len(suggestions) == 2
     assert any(s.type == SuggestionType.DAMAGE_ASSESSMENT for s in suggestions)
     assert any(s.type == SuggestionType.FRAUD_DETECTION for s in suggestions)
 
-def test_suggestions_service_update_suggestion(
+@pytest.mark.asyncio
+async def test_suggestions_service_update_suggestion(
     suggestions_service: SuggestionsService,
     sample_suggestion_data: dict
 ):
     # Create a suggestion
-    suggestion = suggestions_service.create_suggestion(sample_suggestion_data)
+    suggestion = await suggestions_service.create_suggestion(dict(sample_suggestion_data))
     
     # Update the suggestion
-    reviewer_id = uuid4()
+    reviewer_id = next_uuid()
     update_data = {
         "status": SuggestionStatus.ACCEPTED,
         "reviewer_id": reviewer_id,
         "review_notes": "Looks good",
         "implementation_notes": "Approved with modifications"
     }
-    updated_suggestion = suggestions_service.update_suggestion(suggestion.id, update_data)
+    updated_suggestion = await suggestions_service.update_suggestion(suggestion.id, update_data)
     
     # Verify suggestion update
     assert updated_suggestion is not None
@@ -295,28 +319,73 @@ def test_suggestions_service_update_suggestion(
     assert updated_suggestion.review_notes == "Looks good"
     assert updated_suggestion.implementation_notes == "Approved with modifications"
 
-def test_suggestions_service_get_metrics(
+@pytest.mark.asyncio
+async def test_suggestions_service_get_metrics(
     suggestions_service: SuggestionsService,
     sample_suggestion_data: dict
 ):
     # Create test suggestions
-    suggestion1 = suggestions_service.create_suggestion({
+    suggestion1 = await suggestions_service.create_suggestion({
         **sample_suggestion_data,
         "type": SuggestionType.DAMAGE_ASSESSMENT,
         "status": SuggestionStatus.PENDING
     })
-    suggestion2 = suggestions_service.create_suggestion({
+    suggestion2 = await suggestions_service.create_suggestion({
         **sample_suggestion_data,
         "type": SuggestionType.FRAUD_DETECTION,
         "status": SuggestionStatus.ACCEPTED
     })
     
     # Get metrics
-    metrics = suggestions_service.get_metrics()
+    metrics = await suggestions_service.get_metrics()
     
     # Verify metrics
     assert metrics["total_suggestions"] == 2
     assert metrics["acceptance_rate"] == 0.5
     assert len(metrics["suggestions_by_type"]) == 2
     assert metrics["suggestions_by_type"][SuggestionType.DAMAGE_ASSESSMENT] == 1
-    assert metrics["suggestions_by_type"][SuggestionType.FRAUD_DETECTION] == 1 
\ No newline at end of file
+    assert metrics["suggestions_by_type"][SuggestionType.FRAUD_DETECTION] == 1 
+
+@pytest.mark.asyncio
+async def test_generate_claim_suggestions_task(
+    db_session,
+    seeded_claim,
+    suggestion_repository,
+    mock_ai_service,
+    now,
+    monkeypatch
+):
+    suggestion = AISuggestion(
+        id=next_uuid(),
+        claim_id=seeded_claim.id,
+        type=SuggestionType.REQUEST_INFO,
+        description="Request repair estimates",
+        confidence_score=0.9,
+        ai_explanation="No repair estimates are attached to the claim",
+        suggested_action=RequestInfoAction(
+            action="Request estimates",
+            requested_information=["Repair estimate"]
+        ),
+        status=SuggestionStatus.PENDING,
+        created_at=now,
+        model_version="gpt-4"
+    )
+    mock_ai_service.analyze_claim.return_value = [suggestion]
+    # The task opens its own session; hand it the test's, inside its SAVEPOINT
+    monkeypatch.setattr(tasks, "SessionLocal", SimpleNamespace(session_factory=lambda: db_session))
+    monkeypatch.setattr(tasks, "get_ai_service", lambda: mock_ai_service)
+    
+    await tasks.generate_claim_suggestions(seeded_claim.id)
+    
+    # Verify the suggestions were stored and cached suggestion reads retired
+    stored = await suggestion_repository.get_by_claim(seeded_claim.id)
+    assert [row.id for row in stored] == [suggestion.id]
+    assert await cache._prefix_version(cache.SUGGESTIONS_CACHE_PREFIX) == 1
+
+@pytest.mark.asyncio
+async def test_cache_get_discards_undecodable_entry(fake_redis):
+    # An entry written before a schema change reads as a miss and is removed
+    fake_redis.store["claim:stale"] = msgspec.json.encode({"policy_number": 123})
+    
+    assert await cache.cache_get("claim:stale", Claim) is None
+    assert "claim:stale" not in fake_redis.store
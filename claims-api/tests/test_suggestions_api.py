@@ -1,117 +1,135 @@
+import msgspec
 import pytest
 from fastapi import status
-from uuid import uuid4
 
 from app.models.enums import SuggestionStatus, SuggestionType
+from app.models.schemas import RequestInfoAction, SuggestedAction
+from _ids import MISSING_ID, next_uuid
 
-def test_generate_suggestions(client, sample_claim, mocker):
+_ACCEPTED = SuggestionStatus.ACCEPTED.value
+_MODIFIED = SuggestionStatus.MODIFIED.value
+_PENDING = SuggestionStatus.PENDING.value
+
+_REVIEWER_ID = str(next_uuid())
+_ACCEPT_REVIEW = {
+    "status": _ACCEPTED,
+    "reviewer_id": _REVIEWER_ID,
+    "reviewer_notes": "Looks good"
+}
+# Encoded once: the review posted for a suggestion that doesn't exist
+_MISSING_REVIEW_BODY = msgspec.json.encode({**_ACCEPT_REVIEW, "suggestion_id": str(MISSING_ID)})
+# Modified actions are SuggestedActions, tagged by "type"
+_MODIFIED_ACTION = RequestInfoAction(
+    action="Schedule an inspection",
+    requested_information=["Inspection report"]
+)
+_JSON_HEADERS = {"content-type": "application/json"}
+
+_CLAIM_SUGGESTIONS_URL = "/api/suggestions/claims/{}/suggestions".format
+_SUGGESTION_URL = "/api/suggestions/{}".format
+_REVIEW_URL = "/api/suggestions/{}/review".format
+
+@pytest.mark.asyncio
+async def test_generate_suggestions(client, sample_claim, ai_service_override):
     # Mock the AI service
-    mock_ai_service = mocker.patch("app.services.ai_service.AIService")
-    mock_ai_service.return_value.analyze_claim.return_value = []
+    ai_service_override.analyze_claim.return_value = []
     
-    response = client.post(f"/suggestions/claims/{sample_claim.id}/suggestions")
+    response = await client.post(_CLAIM_SUGGESTIONS_URL(sample_claim.id))
     assert response.status_code == status.HTTP_201_CREATED
-    mock_ai_service.return_value.analyze_claim.assert_called_once()
+    ai_service_override.analyze_claim.assert_called_once()
 
-def test_generate_suggestions_nonexistent_claim(client):
-    response = client.post(f"/suggestions/claims/{uuid4()}/suggestions")
+@pytest.mark.asyncio
+async def test_generate_suggestions_nonexistent_claim(client):
+    response = await client.post(_CLAIM_SUGGESTIONS_URL(MISSING_ID))
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
-def test_list_claim_suggestions(client, sample_suggestion):
-    response = client.get(f"/suggestions/claims/{sample_suggestion.claim_id}/suggestions")
+@pytest.mark.asyncio
+async def test_list_claim_suggestions(client, sample_suggestion):
+    response = await client.get(_CLAIM_SUGGESTIONS_URL(sample_suggestion.claim_id))
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert len(data) == 1
-    assert data[0]["id"] == str(sample_suggestion.id)
+    data = msgspec.json.decode(response.content)
+    assert len(data["items"]) == 1
+    assert data["items"][0]["id"] == str(sample_suggestion.id)
+    assert data["next_before"] is None
 
-def test_list_claim_suggestions_with_status_filter(client, sample_suggestion):
-    response = client.get(
-        f"/suggestions/claims/{sample_suggestion.claim_id}/suggestions",
-        params={"status": SuggestionStatus.PENDING.value}
+@pytest.mark.asyncio
+async def test_list_claim_suggestions_with_status_filter(client, sample_suggestion):
+    response = await client.get(
+        _CLAIM_SUGGESTIONS_URL(sample_suggestion.claim_id),
+        params={"status": _PENDING}
     )
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert len(data) == 1
-    assert data[0]["status"] == SuggestionStatus.PENDING.value
+    data = msgspec.json.decode(response.content)
+    assert len(data["items"]) == 1
+    assert data["items"][0]["status"] == _PENDING
 
-def test_get_suggestion(client, sample_suggestion):
-    response = client.get(f"/suggestions/{sample_suggestion.id}")
+@pytest.mark.asyncio
+async def test_get_suggestion(client, sample_suggestion):
+    response = await client.get(_SUGGESTION_URL(sample_suggestion.id))
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = msgspec.json.decode(response.content)
     assert data["id"] == str(sample_suggestion.id)
     assert data["type"] == sample_suggestion.type.value
     assert data["confidence_score"] == sample_suggestion.confidence_score
 
-def test_get_nonexistent_suggestion(client):
-    response = client.get(f"/suggestions/{uuid4()}")
+@pytest.mark.asyncio
+async def test_get_nonexistent_suggestion(client):
+    response = await client.get(_SUGGESTION_URL(MISSING_ID))
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
-def test_review_suggestion(client, sample_suggestion):
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "review_status, reviewer_notes, modified_action",
+    [
+        (_ACCEPTED, "Looks good", None),
+        (_MODIFIED, "Modified action", _MODIFIED_ACTION)
+    ],
+    ids=["accept", "modify"]
+)
+async def test_review_suggestion(
+    client, sample_suggestion, review_status, reviewer_notes, modified_action
+):
     review_data = {
-        "status": SuggestionStatus.ACCEPTED.value,
-        "reviewer_id": str(uuid4()),
-        "reviewer_notes": "Looks good",
-        "modified_action": None
+        "suggestion_id": str(sample_suggestion.id),
+        "status": review_status,
+        "reviewer_id": _REVIEWER_ID,
+        "reviewer_notes": reviewer_notes,
+        "modified_action": msgspec.to_builtins(modified_action) if modified_action else None
     }
     
-    response = client.post(f"/suggestions/{sample_suggestion.id}/review", json=review_data)
+    response = await client.post(_REVIEW_URL(sample_suggestion.id), json=review_data)
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = msgspec.json.decode(response.content)
     assert data["status"] == review_data["status"]
     assert data["reviewer_notes"] == review_data["reviewer_notes"]
     assert "reviewed_at" in data
+    if modified_action is not None:
+        assert msgspec.convert(data["suggested_action"], SuggestedAction) == modified_action
 
-def test_review_suggestion_with_modification(client, sample_suggestion):
-    review_data = {
-        "status": SuggestionStatus.MODIFIED.value,
-        "reviewer_id": str(uuid4()),
-        "reviewer_notes": "Modified action",
-        "modified_action": "Updated inspection schedule"
-    }
-    
-    response = client.post(f"/suggestions/{sample_suggestion.id}/review", json=review_data)
-    assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert data["status"] == review_data["status"]
-    assert data["suggested_action"] == review_data["modified_action"]
-
-def test_review_nonexistent_suggestion(client):
-    review_data = {
-        "status": SuggestionStatus.ACCEPTED.value,
-        "reviewer_id": str(uuid4()),
-        "reviewer_notes": "Looks good"
-    }
-    
-    response = client.post(f"/suggestions/{uuid4()}/review", json=review_data)
+@pytest.mark.asyncio
+async def test_review_nonexistent_suggestion(client):
+    response = await client.post(
+        _REVIEW_URL(MISSING_ID), content=_MISSING_REVIEW_BODY, headers=_JSON_HEADERS
+    )
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
-def test_review_already_reviewed_suggestion(client, sample_suggestion):
-    # First review
+@pytest.mark.asyncio
+async def test_review_already_reviewed_suggestion(client, reviewed_suggestion_factory):
+    suggestion = await reviewed_suggestion_factory(reviewer_notes="First review")
+
     review_data = {
-        "status": SuggestionStatus.ACCEPTED.value,
-        "reviewer_id": str(uuid4()),
-        "reviewer_notes": "First review"
+        **_ACCEPT_REVIEW,
+        "suggestion_id": str(suggestion.id),
+        "reviewer_notes": "Second review"
     }
-    client.post(f"/suggestions/{sample_suggestion.id}/review", json=review_data)
-    
-    # Try to review again
-    review_data["reviewer_notes"] = "Second review"
-    response = client.post(f"/suggestions/{sample_suggestion.id}/review", json=review_data)
+    response = await client.post(_REVIEW_URL(suggestion.id), json=review_data)
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-def test_get_suggestion_metrics(client, sample_suggestion):
-    # First, review the suggestion
-    review_data = {
-        "status": SuggestionStatus.ACCEPTED.value,
-        "reviewer_id": str(uuid4()),
-        "reviewer_notes": "Looks good"
-    }
-    client.post(f"/suggestions/{sample_suggestion.id}/review", json=review_data)
-    
-    # Get metrics
-    response = client.get("/suggestions/metrics")
+@pytest.mark.asyncio
+async def test_get_suggestion_metrics(client, reviewed_suggestion):
+    response = await client.get("/api/suggestions/metrics")
     assert response.status_code == status.HTTP_200_OK
-    data = response.json()
+    data = msgspec.json.decode(response.content)
     assert data["total_suggestions"] == 1
     assert data["acceptance_rate"] == 1.0
     assert data["rejection_rate"] == 0.0